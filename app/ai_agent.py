@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 from typing import Any
@@ -35,8 +36,9 @@ class CodeReviewAgent:
             compressed = code
 
         # Step 2: Run static analysis (flake8/bandit are python-only).
+        # The checks shell out to subprocesses, so keep them off the event loop.
         if lang == "python" and (filename or "").lower().endswith(".py"):
-            static_result = run_static_analysis(code=code, filename=filename)
+            static_result = await asyncio.to_thread(run_static_analysis, code=code, filename=filename)
             static_dict: dict[str, Any] = {"flake8": static_result.flake8, "bandit": static_result.bandit}
         else:
             static_dict = {"flake8": {"skipped": True}, "bandit": {"skipped": True}}
@@ -45,7 +47,7 @@ class CodeReviewAgent:
         review_prompt = self._build_review_prompt(compressed, static_dict, language=lang, strict=strict)
 
         # Step 4: Optionally compress the prompt with ScaleDown (compression only)
-        compressed_prompt, used_scaledown = compress_with_scaledown(review_prompt)
+        compressed_prompt, used_scaledown = await asyncio.to_thread(compress_with_scaledown, review_prompt)
         logger.debug("ScaleDown used: %s", used_scaledown)
 
         # Step 5: Send the compressed prompt to the REAL LLM
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Mapping
+from functools import lru_cache
 from typing import Any
 
 from app.analysis.aggregate import dedupe_issues
@@ -33,6 +35,19 @@ def _is_js_ts_file(filename: str) -> bool:
     return name.endswith(".js") or name.endswith(".jsx") or name.endswith(".ts") or name.endswith(".tsx")
 
 
+@lru_cache(maxsize=8)
+def _blocked_categories(allow_security: bool, allow_style: bool, allow_perf: bool) -> frozenset[Category]:
+    # Only these three are toggleable from the UI; every other category stays always-on.
+    blocked: set[Category] = set()
+    if not allow_security:
+        blocked.add(Category.security)
+    if not allow_style:
+        blocked.add(Category.style)
+    if not allow_perf:
+        blocked.add(Category.performance)
+    return frozenset(blocked)
+
+
 class ReviewPipeline:
     def __init__(self, *, llm_client: Any | None):
         self._llm = llm_client
@@ -45,7 +60,8 @@ class ReviewPipeline:
         strict: bool,
         enabled_rules: dict[str, bool] | None = None,
         language: str = "python",
-        enabled_checks: dict[str, bool] | None = None,
+        enabled_checks: Mapping[str, bool] | None = None,
+        run_static: bool = True,
     ) -> ReviewResult:
         code = preprocess_code(code=code)
         lang = (language or "python").strip().lower()
@@ -53,7 +69,14 @@ class ReviewPipeline:
         is_python_file = lang == "python" and (filename or "").lower().endswith(".py")
         is_js_ts = lang in {"javascript", "typescript"} and _is_js_ts_file(filename)
 
-        static_dict = run_static_analysis_for_language(code=code, filename=filename, language=lang)
+        if run_static:
+            static_dict = run_static_analysis_for_language(code=code, filename=filename, language=lang)
+        else:
+            # Linters dominate review_file wallclock; callers that only need rules/LLM findings can opt out.
+            static_dict = {
+                tool: {"tool": tool, "skipped": True, "reason": "static analysis disabled"}
+                for tool in ("flake8", "bandit", "eslint")
+            }
 
         issues = []
         diagnostics: list[ReviewDiagnostic] = []
@@ -151,21 +174,13 @@ class ReviewPipeline:
         issues = dedupe_issues(issues)
 
         if enabled_checks:
-            allow_security = bool(enabled_checks.get("security", True))
-            allow_style = bool(enabled_checks.get("style", True))
-            allow_perf = bool(enabled_checks.get("performance", True))
-
-            def _allowed(cat: Category) -> bool:
-                if cat == Category.security:
-                    return allow_security
-                if cat == Category.style:
-                    return allow_style
-                if cat == Category.performance:
-                    return allow_perf
-                # UI does not expose toggles for these; keep them always-on.
-                return True
-
-            issues = [i for i in issues if _allowed(i.category)]
+            blocked = _blocked_categories(
+                bool(enabled_checks.get("security", True)),
+                bool(enabled_checks.get("style", True)),
+                bool(enabled_checks.get("performance", True)),
+            )
+            if blocked:
+                issues = [i for i in issues if i.category not in blocked]
 
         score = score_issues(issues=issues, strict=strict)
         return ReviewResult(issues=issues, score=score, static_analysis=static_dict, diagnostics=diagnostics)
@@ -4,6 +4,7 @@ import ast
 import io
 import tokenize
 from dataclasses import dataclass
+from functools import lru_cache
 
 
 @dataclass(frozen=True)
@@ -12,6 +13,12 @@ class CompressedContext:
 
 
 def compress_python_code(code: str) -> CompressedContext:
+    return _compress_cached(code)
+
+
+@lru_cache(maxsize=128)
+def _compress_cached(code: str) -> CompressedContext:
+    # Compression is pure and CompressedContext is frozen, so identical inputs can share a result.
     stripped = _strip_comments(code)
     tree: ast.Module = ast.parse(stripped)
     tree = _strip_docstrings_ast(tree)  # type: ignore[assignment]
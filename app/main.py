@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
 import os
 import pathlib
@@ -7,8 +9,8 @@ import re
 import urllib.parse
 
 import requests
-from fastapi import APIRouter, Body, Depends, FastAPI, File, Header, HTTPException, UploadFile
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import APIRouter, Body, Depends, FastAPI, File, Header, HTTPException, Request, UploadFile
+from fastapi.responses import FileResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from starlette.middleware.cors import CORSMiddleware
 
@@ -18,6 +20,7 @@ from app.deps import get_agent
 from app.firebase_debug import get_token_hints
 from app.logging_config import configure_logging
 from app.models import ReviewRequest, ReviewResponse
+from app.request_decompression import GzipRequestMiddleware
 from app.routers.format import router as format_router
 from app.routers.review_v2 import router as review_v2_router
 from app.settings import Settings
@@ -63,6 +66,10 @@ else:
         extra={"env": "CODE_REVIEW_CORS_ORIGINS"},
     )
 
+# --- Request decompression ---
+# Large pasted sources may arrive gzip-compressed (Content-Encoding: gzip); inflate them before routing.
+app.add_middleware(GzipRequestMiddleware)
+
 # v2 routes
 app.include_router(review_v2_router)
 app.include_router(format_router)
@@ -271,40 +278,25 @@ async def review_file_endpoint(
     return JSONResponse(out)
 
 
-@app.post("/review/github", response_model=ReviewResponse)
-async def review_github_endpoint(
-    payload: dict = Body(...),
-    agent: CodeReviewAgent = Depends(get_agent),
-    settings: Settings = Depends(deps.get_settings_dep),
-):
-    """Review a GitHub repo by fetching a single file from it.
+_GITHUB_BATCH_MAX_PATHS = 10
 
-    Accepts:
-      {"repo_url": "https://github.com/owner/repo", "path": "path/in/repo.py", "ref": "main", "strict": false, "language": "optional"}
 
-    Note: This uses the unauthenticated raw GitHub endpoint. Large/complex repos
-    are intentionally out-of-scope for now.
-    """
-    repo_url = _normalize_github_repo_url(payload.get("repo_url") or "")
-    path = (payload.get("path") or "").strip() or "README.md"
-    ref = (payload.get("ref") or "").strip() or "main"
-    strict = bool(payload.get("strict") or False)
+async def _review_github_path(
+    agent: CodeReviewAgent, *, repo_url: str, path: str, ref: str, strict: bool, language: str
+) -> dict:
+    """Fetch one file from raw.githubusercontent.com and review it (ReviewResponse as a dict).
 
-    lang = (payload.get("language") or "").strip().lower() or _infer_language_from_filename(path)
+    Raises HTTPException for fetch and LLM failures; callers validate settings first.
+    """
+    lang = language or _infer_language_from_filename(path)
 
     parsed = urllib.parse.urlparse(repo_url)
     owner, repo = [p for p in parsed.path.strip("/").split("/") if p][:2]
     raw_url = f"https://raw.githubusercontent.com/{owner}/{repo}/{ref}/{path}"
 
-    # This endpoint requires network access. Keep it deterministic for judges:
-    # if offline mode is enabled, fail fast with a clear message.
-    if (settings.llm_provider or "openai").lower().strip() == "none":
-        raise HTTPException(status_code=400, detail="GitHub review is disabled in offline mode (LLM_PROVIDER=none)")
-
-    _ensure_llm_configured(settings)
-
     try:
-        r = requests.get(raw_url, timeout=15)
+        # Off the event loop: a slow raw.githubusercontent.com fetch must not stall other requests.
+        r = await asyncio.to_thread(requests.get, raw_url, timeout=15)
     except requests.exceptions.RequestException as e:
         raise HTTPException(status_code=502, detail=f"Failed to fetch GitHub raw file: {e.__class__.__name__}")
 
@@ -325,11 +317,90 @@ async def review_github_endpoint(
         issues=issues,
         strict_findings=(format_strict_findings(issues) if strict else None),
     )
+    return resp_model.model_dump()
 
-    out = resp_model.model_dump()
+
+def _ensure_github_review_enabled(settings: Settings) -> None:
+    # This endpoint requires network access. Keep it deterministic for judges:
+    # if offline mode is enabled, fail fast with a clear message.
+    if (settings.llm_provider or "openai").lower().strip() == "none":
+        raise HTTPException(status_code=400, detail="GitHub review is disabled in offline mode (LLM_PROVIDER=none)")
+
+    _ensure_llm_configured(settings)
+
+
+@app.post("/review/github", response_model=ReviewResponse)
+async def review_github_endpoint(
+    payload: dict = Body(...),
+    agent: CodeReviewAgent = Depends(get_agent),
+    settings: Settings = Depends(deps.get_settings_dep),
+):
+    """Review a GitHub repo by fetching a single file from it.
+
+    Accepts:
+      {"repo_url": "https://github.com/owner/repo", "path": "path/in/repo.py", "ref": "main", "strict": false, "language": "optional"}
+
+    Note: This uses the unauthenticated raw GitHub endpoint. Large/complex repos
+    are intentionally out-of-scope for now.
+    """
+    repo_url = _normalize_github_repo_url(payload.get("repo_url") or "")
+    path = (payload.get("path") or "").strip() or "README.md"
+    ref = (payload.get("ref") or "").strip() or "main"
+    strict = bool(payload.get("strict") or False)
+    language = (payload.get("language") or "").strip().lower()
+
+    _ensure_github_review_enabled(settings)
+
+    out = await _review_github_path(agent, repo_url=repo_url, path=path, ref=ref, strict=strict, language=language)
     return JSONResponse(out)
 
 
+@app.post("/review/github/batch")
+async def review_github_batch_endpoint(
+    payload: dict = Body(...),
+    agent: CodeReviewAgent = Depends(get_agent),
+    settings: Settings = Depends(deps.get_settings_dep),
+):
+    """Review several files of one GitHub repo in a single request.
+
+    Accepts:
+      {"repo_url": "https://github.com/owner/repo", "paths": ["a.py", "pkg/b.py"], "ref": "main", "strict": false, "language": "optional"}
+
+    Returns {"results": [{"path": ..., "review": {...} | null, "error": "..." | null}, ...]} in request
+    order. Files are fetched and reviewed concurrently; a failing path does not fail the others.
+    """
+    repo_url = _normalize_github_repo_url(payload.get("repo_url") or "")
+    raw_paths = payload.get("paths")
+    if not isinstance(raw_paths, list):
+        raise HTTPException(status_code=400, detail="paths must be a list of file paths")
+    # Drop blanks and duplicates, keeping the first occurrence's position.
+    paths = list(dict.fromkeys(p.strip() for p in raw_paths if isinstance(p, str) and p.strip()))
+    if not paths:
+        raise HTTPException(status_code=400, detail="paths must contain at least one file path")
+    if len(paths) > _GITHUB_BATCH_MAX_PATHS:
+        raise HTTPException(status_code=400, detail=f"At most {_GITHUB_BATCH_MAX_PATHS} paths per batch")
+    ref = (payload.get("ref") or "").strip() or "main"
+    strict = bool(payload.get("strict") or False)
+    language = (payload.get("language") or "").strip().lower()
+
+    _ensure_github_review_enabled(settings)
+
+    async def _one(path: str) -> dict:
+        try:
+            review = await _review_github_path(
+                agent, repo_url=repo_url, path=path, ref=ref, strict=strict, language=language
+            )
+        except HTTPException as e:
+            return {"path": path, "review": None, "error": str(e.detail)}
+        except Exception as e:
+            logger.exception("GitHub batch review failed for path %s", path)
+            return {"path": path, "review": None, "error": f"Review failed: {type(e).__name__}: {e}"}
+        return {"path": path, "review": review, "error": None}
+
+    results = await asyncio.gather(*(_one(p) for p in paths))
+    return JSONResponse({"results": results})
+
+
 async def _read_code_from_file(*, file: UploadFile) -> tuple[str, str]:
     raw = await file.read()
     try:
@@ -351,8 +422,21 @@ async def _read_code(*, payload: ReviewRequest | None, file: UploadFile | None)
     return payload.code, payload.filename or "input.py"
 
 
+def _json_with_etag(request: Request, payload: dict) -> Response:
+    """JSON response tagged with a content ETag; a matching If-None-Match gets an empty 304.
+
+    The UI polls /healthz and /configz on reruns, and their bodies rarely change.
+    """
+    resp = JSONResponse(payload)
+    etag = f'"{hashlib.blake2b(resp.body, digest_size=8).hexdigest()}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    resp.headers["ETag"] = etag
+    return resp
+
+
 @app.get("/healthz")
-def healthz():
+def healthz(request: Request):
     # Avoid secrets: only report whether Firebase verification is configured and initialized.
     fb_configured = bool(
         os.getenv("FIREBASE_SERVICE_ACCOUNT_JSON")
@@ -360,19 +444,20 @@ def healthz():
         or os.path.exists(os.path.join(os.getcwd(), "firebase-service-account.json"))
     )
     fb_initialized = bool(firebase_auth._init_admin())  # type: ignore[attr-defined]
-    return JSONResponse(
+    return _json_with_etag(
+        request,
         {
             "ok": True,
             "service": "code-review-agent",
             "version": APP_VERSION,
             "firebase_configured": fb_configured,
             "firebase_initialized": fb_initialized,
-        }
+        },
     )
 
 
 @app.get("/configz")
-def configz():
+def configz(request: Request):
     # Never return the key itself.
     llm_key_set = bool(os.getenv("LLM_API_KEY"))
     scaledown_key_set = bool(os.getenv("SCALEDOWN_API_KEY"))
@@ -385,7 +470,8 @@ def configz():
 
     fb_source = firebase_auth._cred_source()  # type: ignore[attr-defined]
     fb_initialized = bool(firebase_auth._init_admin())  # type: ignore[attr-defined]
-    return JSONResponse(
+    return _json_with_etag(
+        request,
         {
             "llm_api_key_set": llm_key_set,
             "llm_base_url": os.getenv("LLM_BASE_URL"),
@@ -398,7 +484,9 @@ def configz():
                 "credential_source": fb_source,
                 "initialized": fb_initialized,
             },
-        }
+            # Lets clients check before compressing request bodies (GzipRequestMiddleware).
+            "request_encodings": ["gzip"],
+        },
     )
 
 
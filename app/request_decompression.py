@@ -0,0 +1,86 @@
+"""Transparent decoding of gzip-compressed request bodies.
+
+Clients (the Streamlit UI) may send large pasted sources with `Content-Encoding: gzip`.
+The middleware inflates the body before routing, so endpoints see plain JSON and need no changes.
+
+Behavior:
+- Only `gzip` is accepted; other encodings pass through untouched.
+- Malformed gzip -> 400; inflated size above the limit -> 413 (guards against zip bombs).
+"""
+
+from __future__ import annotations
+
+import zlib
+
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+DEFAULT_MAX_DECOMPRESSED_BYTES = 10 * 1024 * 1024
+
+
+class _BodyTooLarge(Exception):
+    pass
+
+
+def _gunzip(data: bytes, *, limit: int) -> bytes:
+    # wbits=16+MAX_WBITS: expect a gzip header/trailer.
+    d = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    out = d.decompress(data, limit + 1)
+    if len(out) > limit or d.unconsumed_tail:
+        raise _BodyTooLarge()
+    out += d.flush()
+    if len(out) > limit:
+        raise _BodyTooLarge()
+    if not d.eof:
+        raise zlib.error("truncated gzip stream")
+    return out
+
+
+class GzipRequestMiddleware:
+    def __init__(self, app: ASGIApp, *, max_decompressed_bytes: int = DEFAULT_MAX_DECOMPRESSED_BYTES) -> None:
+        self.app = app
+        self.max_decompressed_bytes = max_decompressed_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = scope.get("headers") or []
+        encoding = next((v for k, v in headers if k == b"content-encoding"), None)
+        if encoding is None or encoding.strip().lower() != b"gzip":
+            await self.app(scope, receive, send)
+            return
+
+        chunks: list[bytes] = []
+        more = True
+        while more:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            more = message.get("more_body", False)
+
+        try:
+            body = _gunzip(b"".join(chunks), limit=self.max_decompressed_bytes)
+        except _BodyTooLarge:
+            await PlainTextResponse("Decompressed request body too large", status_code=413)(scope, receive, send)
+            return
+        except zlib.error:
+            await PlainTextResponse("Malformed gzip request body", status_code=400)(scope, receive, send)
+            return
+
+        new_headers = [(k, v) for k, v in headers if k not in (b"content-encoding", b"content-length")]
+        new_headers.append((b"content-length", str(len(body)).encode("latin-1")))
+        scope = dict(scope, headers=new_headers)
+
+        sent = False
+
+        async def _receive() -> Message:
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        await self.app(scope, _receive, send)
@@ -16,6 +16,7 @@ from __future__ import annotations
 
 import logging
 import os
+from functools import lru_cache
 
 import httpx
 
@@ -25,6 +26,16 @@ _SCALEDOWN_URL = "https://api.scaledown.xyz/compress/raw/"
 _TIMEOUT_SECONDS = 10.0
 
 
+@lru_cache(maxsize=1)
+def _get_client() -> httpx.Client:
+    # One pooled client per process so repeat compressions reuse the TCP/TLS connection.
+    return httpx.Client(
+        timeout=_TIMEOUT_SECONDS,
+        follow_redirects=True,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=30),
+    )
+
+
 def _env_truthy(val: str | None) -> bool:
     v = (val or "").strip().lower()
     if v in {"1", "true", "yes", "y", "on"}:
@@ -67,10 +78,9 @@ def compress_with_scaledown(prompt: str) -> tuple[str, bool]:
     }
 
     try:
-        with httpx.Client(timeout=_TIMEOUT_SECONDS, follow_redirects=True) as client:
-            resp = client.post(_SCALEDOWN_URL, json=payload, headers=headers)
-            resp.raise_for_status()
-            data = resp.json()
+        resp = _get_client().post(_SCALEDOWN_URL, json=payload, headers=headers)
+        resp.raise_for_status()
+        data = resp.json()
 
         compressed = data.get("compressed") or data.get("result")
         if not isinstance(compressed, str) or not compressed.strip():
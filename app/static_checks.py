@@ -1,14 +1,20 @@
 from __future__ import annotations
 
 import ast
+import copy
+import hashlib
 import json
 import os
 import shutil
 import subprocess
 import sys
 import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any
 
 
@@ -18,20 +24,64 @@ class StaticAnalysisResult:
     bandit: dict[str, Any]
 
 
+# Reviews of unchanged code are common (re-clicks, project reviews re-sending files), and the
+# linters are deterministic for a given input, so successful runs are memoized per process.
+_STATIC_CACHE_MAX = 128
+_STATIC_CACHE: OrderedDict[tuple[bytes, str, bool], StaticAnalysisResult] = OrderedDict()
+_STATIC_CACHE_LOCK = threading.Lock()
+
+
+def clear_static_analysis_cache() -> None:
+    with _STATIC_CACHE_LOCK:
+        _STATIC_CACHE.clear()
+
+
 def run_static_analysis(*, code: str, filename: str = "input.py") -> StaticAnalysisResult:
     """Run flake8 and bandit on code by writing it to a temp file.
 
     Note: We also run a tiny built-in sanity check to catch obvious problems
     (syntax errors and undefined names) even when external tools aren't
     available or return empty output.
+
+    Results are memoized by (code digest, filename, linter mode); tool failures are never cached.
     """
+    digest = hashlib.blake2b(code.encode("utf-8"), digest_size=16).digest()
+    key = (digest, filename, _inproc_linters_enabled())
+    with _STATIC_CACHE_LOCK:
+        hit = _STATIC_CACHE.get(key)
+        if hit is not None:
+            _STATIC_CACHE.move_to_end(key)
+    if hit is not None:
+        return _copy_result(hit)
+
+    result = _run_static_analysis_uncached(code=code, filename=filename)
+    if _is_cacheable(result):
+        with _STATIC_CACHE_LOCK:
+            _STATIC_CACHE[key] = _copy_result(result)
+            while len(_STATIC_CACHE) > _STATIC_CACHE_MAX:
+                _STATIC_CACHE.popitem(last=False)
+    return result
+
+
+def _copy_result(result: StaticAnalysisResult) -> StaticAnalysisResult:
+    # Callers may annotate the dicts they get back; never hand out the cached instance.
+    return StaticAnalysisResult(flake8=copy.deepcopy(result.flake8), bandit=copy.deepcopy(result.bandit))
+
+
+def _is_cacheable(result: StaticAnalysisResult) -> bool:
+    flake8, bandit = result.flake8, result.bandit
+    if flake8.get("tool_error") or flake8.get("parse_error") or flake8.get("exit_code") not in (0, 1):
+        return False
+    return bandit.get("exit_code") in (0, 1) and isinstance(bandit.get("result"), dict)
+
+
+def _run_static_analysis_uncached(*, code: str, filename: str) -> StaticAnalysisResult:
     with tempfile.TemporaryDirectory(prefix="code_review_agent_") as tmp:
         path = os.path.join(tmp, filename)
         with open(path, "w", encoding="utf-8", newline="\n") as f:
             f.write(code)
 
-        flake8 = _run_flake8(path)
-        bandit = _run_bandit(path)
+        flake8, bandit = _run_linters(path)
 
     flake8 = _augment_with_builtin_checks(code=code, filename=filename, flake8=flake8)
     return StaticAnalysisResult(flake8=flake8, bandit=bandit)
@@ -54,8 +104,7 @@ def run_static_analysis_on_file(path: str) -> dict[str, Any]:
     if not path.lower().endswith(".py"):
         raise ValueError("Only .py files are supported")
 
-    flake8 = _run_flake8(path)
-    bandit = _run_bandit(path)
+    flake8, bandit = _run_linters(path)
 
     now = datetime.now(timezone.utc).isoformat()
     return {
@@ -65,18 +114,40 @@ def run_static_analysis_on_file(path: str) -> dict[str, Any]:
     }
 
 
+def _run_linters(path: str) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Run flake8 and bandit on one file; as subprocesses, the two overlap instead of running back to back."""
+    if _inproc_linters_enabled():
+        # In-process runs are CPU-bound under the GIL; threading them would only add overhead.
+        return _run_flake8(path), _run_bandit(path)
+
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="static-checks") as pool:
+        bandit_future = pool.submit(_run_bandit, path)
+        flake8 = _run_flake8(path)
+        return flake8, bandit_future.result()
+
+
+def _inproc_linters_enabled() -> bool:
+    """True when CODE_REVIEW_INPROC_LINTERS asks for flake8/bandit to run inside this process.
+
+    Spawning `python -m flake8` / `python -m bandit` pays interpreter startup on every call;
+    the in-process path skips that at the cost of sharing this process's flake8/bandit install.
+    """
+    return (os.getenv("CODE_REVIEW_INPROC_LINTERS") or "").strip().lower() in {"1", "true", "yes", "y", "on"}
+
+
+# Use a delimiter that won't conflict with Windows drive letters ("C:\\...").
+# ':' is ambiguous on Windows and can lead to empty issue lists even when flake8
+# reports findings. Lines are split with str.split(maxsplit=4), which is cheaper than
+# a regex and keeps any '|' inside the message text intact.
+_FLAKE8_DELIMITER = "|"
+_FLAKE8_FORMAT_ARG = "--format=" + _FLAKE8_DELIMITER.join(["%(path)s", "%(row)d", "%(col)d", "%(code)s", "%(text)s"])
+
+
 def _run_flake8(path: str) -> dict[str, Any]:
-    # Use a delimiter that won't conflict with Windows drive letters ("C:\\...").
-    # ':' is ambiguous on Windows and can lead to empty issue lists even when flake8
-    # reports findings.
-    delimiter = "|"
-    cmd = [
-        sys.executable,
-        "-m",
-        "flake8",
-        f"--format=%(path)s{delimiter}%(row)d{delimiter}%(col)d{delimiter}%(code)s{delimiter}%(text)s",
-        path,
-    ]
+    if _inproc_linters_enabled():
+        return _run_flake8_inproc(path)
+
+    cmd = [sys.executable, "-m", "flake8", _FLAKE8_FORMAT_ARG, path]
 
     try:
         p = subprocess.run(cmd, capture_output=True, text=True)
@@ -95,7 +166,7 @@ def _run_flake8(path: str) -> dict[str, Any]:
 
     out = (p.stdout or "").strip()
     for line in out.splitlines():
-        parts = line.split(delimiter, 4)
+        parts = line.split(_FLAKE8_DELIMITER, 4)
         if len(parts) != 5:
             # Don't drop the whole run silently if output is present but unparsable.
             parse_error = True
@@ -147,7 +218,65 @@ def _run_flake8(path: str) -> dict[str, Any]:
     return result
 
 
+# The flake8 style guide carries per-run reporter state; serialize access to the shared instance.
+_FLAKE8_GUIDE_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _flake8_style_guide() -> Any:
+    # Option parsing + plugin discovery is the expensive part of flake8 startup; do it once.
+    from flake8.api.legacy import get_style_guide
+
+    return get_style_guide()
+
+
+def _run_flake8_inproc(path: str) -> dict[str, Any]:
+    """Same result shape as _run_flake8, produced via flake8's Python API."""
+    issues: list[dict[str, Any]] = []
+
+    try:
+        from flake8.formatting.base import BaseFormatter
+
+        class _Collector(BaseFormatter):
+            def handle(self, error: Any) -> None:
+                issues.append(
+                    {
+                        "path": error.filename,
+                        "row": int(error.line_number),
+                        "col": int(error.column_number),
+                        "code": error.code,
+                        "message": (error.text or "").strip(),
+                    }
+                )
+
+            def format(self, error: Any) -> str | None:
+                return None
+
+        with _FLAKE8_GUIDE_LOCK:
+            guide = _flake8_style_guide()
+            guide.init_report(_Collector)
+            guide.check_files([path])
+    except Exception as e:
+        return {
+            "exit_code": 2,
+            "issues": [],
+            "stderr": f"{type(e).__name__}: {e}",
+            "tool": "flake8",
+            "tool_error": True,
+        }
+
+    return {
+        "exit_code": 1 if issues else 0,
+        "issues": issues,
+        "stderr": "",
+        "tool": "flake8",
+    }
+
+
 def _run_bandit(path: str) -> dict[str, Any]:
+    if _inproc_linters_enabled():
+        return _run_bandit_inproc(path)
+
     cmd = [sys.executable, "-m", "bandit", "-q", "-f", "json", path]
 
     try:
@@ -173,6 +302,42 @@ def _run_bandit(path: str) -> dict[str, Any]:
     }
 
 
+@lru_cache(maxsize=1)
+def _bandit_config() -> Any:
+    from bandit.core import config as bandit_config
+
+    return bandit_config.BanditConfig()
+
+
+def _run_bandit_inproc(path: str) -> dict[str, Any]:
+    """Same result shape as _run_bandit, produced via bandit's BanditManager."""
+    try:
+        from bandit.core import docs_utils
+        from bandit.core import manager as bandit_manager
+
+        mgr = bandit_manager.BanditManager(_bandit_config(), "file", quiet=True)
+        mgr.discover_files([path])
+        mgr.run_tests()
+
+        results = [i.as_dict() for i in mgr.get_issue_list()]
+        for r in results:
+            r["more_info"] = docs_utils.get_url(r["test_id"])
+        result: dict[str, Any] = {
+            "errors": [{"filename": fname, "reason": reason} for fname, reason in mgr.get_skipped()],
+            "metrics": mgr.metrics.data,
+            "results": results,
+        }
+    except Exception as e:
+        return {"exit_code": 2, "result": {}, "stderr": f"{type(e).__name__}: {e}", "tool": "bandit"}
+
+    return {
+        "exit_code": 1 if results else 0,
+        "result": result,
+        "stderr": "",
+        "tool": "bandit",
+    }
+
+
 def _augment_with_builtin_checks(*, code: str, filename: str, flake8: dict[str, Any]) -> dict[str, Any]:
     """Augment flake8-like output with a minimal built-in analyzer.
 
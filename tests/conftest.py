@@ -1,11 +1,159 @@
 from __future__ import annotations
 
+import asyncio
+import importlib
+import os
+import subprocess
+from collections.abc import Callable, Iterator
+from types import ModuleType
+from typing import Any, Literal
+
+import httpx
 import pytest
 from fastapi.testclient import TestClient
+from pytest_asyncio import is_async_test
 
+from app.analysis.pipeline import ReviewPipeline
 from app.main import app
 
 
+def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
+    # Run every async test on one session-wide event loop; these tests are short,
+    # so building and tearing down a loop per test dominates their runtime.
+    session_loop = pytest.mark.asyncio(scope="session")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(session_loop, append=False)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _inproc_linters() -> Iterator[None]:
+    # Run flake8/bandit through their Python APIs instead of spawning an interpreter per call.
+    mp = pytest.MonkeyPatch()
+    mp.setenv("CODE_REVIEW_INPROC_LINTERS", "1")
+    yield
+    mp.undo()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _offline_llm() -> Iterator[None]:
+    # Offline by default: no test may reach a real LLM. Tests that need a provider opt in via llm_env.
+    mp = pytest.MonkeyPatch()
+    mp.setenv("LLM_PROVIDER", "none")
+    for key in ("LLM_API_KEY", "LLM_BASE_URL", "LLM_MODEL"):
+        mp.delenv(key, raising=False)
+    yield
+    mp.undo()
+
+
+@pytest.fixture(scope="session")
+def response_json() -> Callable[[httpx.Response], Any]:
+    """Decode a test client's response body for assertions; orjson parses the raw bytes when installed.
+
+    Test-side only: app code keeps httpx's own Response.json, so its decode path is what gets tested.
+    """
+    try:
+        import orjson
+    except ImportError:
+        return lambda resp: resp.json()
+    return lambda resp: orjson.loads(resp.content)
+
+
+class FakeCompletedProcess:
+    def __init__(self, *, returncode: int = 0, stdout: str = "", stderr: str = "") -> None:
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+
+
+_EMPTY_BANDIT_REPORT = '{"errors": [], "metrics": {}, "results": []}'
+
+
+@pytest.fixture()
+def fake_flake8_run(monkeypatch: pytest.MonkeyPatch) -> Callable[..., list[list[str]]]:
+    """Force the subprocess linter path: flake8 answers with canned output, bandit with an empty report.
+
+    Returns an installer taking (stdout, returncode) for flake8; the installer returns the list of commands seen.
+    """
+
+    def _install(stdout: str = "", returncode: int = 0) -> list[list[str]]:
+        calls: list[list[str]] = []
+
+        def _run(cmd: list[str], *args: Any, **kwargs: Any) -> FakeCompletedProcess:
+            calls.append(cmd)
+            if "flake8" in cmd:
+                return FakeCompletedProcess(returncode=returncode, stdout=stdout)
+            if "bandit" in cmd:
+                return FakeCompletedProcess(stdout=_EMPTY_BANDIT_REPORT)
+            raise AssertionError(f"unexpected subprocess: {cmd!r}")
+
+        monkeypatch.delenv("CODE_REVIEW_INPROC_LINTERS", raising=False)
+        monkeypatch.setattr(subprocess, "run", _run)
+        return calls
+
+    return _install
+
+
+LLMEnvMode = Literal["openai", "unset"]
+
+
 @pytest.fixture()
-def client() -> TestClient:
-    return TestClient(app)
+def llm_env(monkeypatch: pytest.MonkeyPatch) -> Callable[[LLMEnvMode], None]:
+    """Switch a test from the offline default to a real-provider LLM config; monkeypatch restores it afterwards.
+
+    - "openai": real provider with dummy credentials (LLMClient.review is expected to be patched)
+    - "unset": real provider selected but LLM_API_KEY empty
+    """
+
+    def _apply(mode: LLMEnvMode) -> None:
+        if mode == "openai":
+            monkeypatch.setenv("LLM_PROVIDER", "openai")
+            monkeypatch.setenv("LLM_API_KEY", "test")
+            monkeypatch.setenv("LLM_BASE_URL", "http://test")
+            monkeypatch.setenv("LLM_MODEL", "test")
+            return
+
+        monkeypatch.setenv("LLM_PROVIDER", "openai")
+        # Explicit empty string so a key in a local .env file can't mask the missing-key case.
+        monkeypatch.setenv("LLM_API_KEY", "")
+
+    return _apply
+
+
+@pytest.fixture(scope="session")
+def api_client() -> Iterator[TestClient]:
+    # One app bootstrap for the whole run; settings are read per request, so env changes still apply.
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture(scope="session")
+def pipeline_noop() -> ReviewPipeline:
+    # ReviewPipeline only holds its LLM client, so one instance can serve every test.
+    return ReviewPipeline(llm_client=None)
+
+
+@pytest.fixture(scope="session")
+def async_client() -> Iterator[httpx.AsyncClient]:
+    # Calls the ASGI app directly on the test's event loop, without TestClient's thread bridge.
+    # Sync on purpose: async fixtures from the pinned pytest-asyncio don't run under pytest 8.4.
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://t")
+    yield client
+    asyncio.run(client.aclose())
+
+
+@pytest.fixture(scope="session")
+def frontend_api_ts_text() -> str:
+    path = os.path.join(os.path.dirname(__file__), os.pardir, "frontend", "client", "services", "api.ts")
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.fixture(scope="session")
+def ui() -> ModuleType:
+    """The Streamlit UI module, imported in bare mode (skips when streamlit is not installed)."""
+    pytest.importorskip("streamlit")
+    with pytest.MonkeyPatch.context() as mp:
+        # ui.py probes its API at import; point it at loopback, which fails fast when nothing listens.
+        mp.setenv("CODE_REVIEW_API_URL", "http://127.0.0.1:8000")
+        return importlib.import_module("ui")
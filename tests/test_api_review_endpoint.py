@@ -1,15 +1,24 @@
-import os
+import httpx
+import pytest
+from pydantic import TypeAdapter
 
-from fastapi.testclient import TestClient
+from app.models import Issue
 
-from app.main import app
+# Built once: validates the fake LLM output through the real Issue model without per-call validator setup.
+_ISSUE_LIST = TypeAdapter(list[Issue])
 
+# strict_findings fragments as they appear JSON-encoded in the response body (newlines escaped).
+_STRICT_FINDINGS_FRAGMENTS: tuple[bytes, ...] = (
+    b'"strict_findings":"Issue 1\\nSeverity: ',
+    b"\\nCategory: ",
+    b"\\nProblem: ",
+    b"\\nSuggestion: ",
+    b"\\n\\nIssue 2\\nSeverity: ",
+)
 
-def test_post_review_returns_ranked_issues(monkeypatch):
-    os.environ["LLM_PROVIDER"] = "openai"
-    os.environ["LLM_API_KEY"] = "test"
-    os.environ["LLM_BASE_URL"] = "http://test"
-    os.environ["LLM_MODEL"] = "test"
+
+def test_post_review_returns_ranked_issues(api_client, response_json, monkeypatch, llm_env):
+    llm_env("openai")
 
     async def fake_review(self, *, compressed_context: str, static_analysis: dict):
         # Unsorted on purpose: should come back ordered by severity then category.
@@ -39,21 +48,18 @@ def test_post_review_returns_ranked_issues(monkeypatch):
 
     async def review_wrapper(self, *, compressed_context: str, static_analysis: dict, review_prompt: str | None = None):
         # Convert dicts to Issue models via the real validation path.
-        from app.models import Issue
-
         raw = await fake_review(self, compressed_context=compressed_context, static_analysis=static_analysis)
-        return [Issue.model_validate(x) for x in raw]
+        return _ISSUE_LIST.validate_python(raw)
 
     monkeypatch.setattr(llm_client.LLMClient, "review", review_wrapper)
 
-    client = TestClient(app)
-    resp = client.post(
+    resp = api_client.post(
         "/review",
         json={"code": "def add(a,b):\n    return a+b\n", "filename": "t.py"},
     )
     assert resp.status_code == 200, resp.text
 
-    data = resp.json()
+    data = response_json(resp)
     assert "compressed_context" in data
     assert "static_analysis" in data
     assert "issues" in data
@@ -64,15 +70,11 @@ def test_post_review_returns_ranked_issues(monkeypatch):
     assert issues[2]["severity"] == "low" and issues[2]["category"] == "style"
 
 
-def test_post_review_missing_llm_config_returns_400(client):
-    # Use an explicit empty string to ensure Settings reads the missing key even if Pydantic cached env.
-    os.environ["LLM_PROVIDER"] = "openai"
-    os.environ["LLM_API_KEY"] = ""
-    # Base URL and model now have defaults, but ensure any inherited env doesn't mask the missing-key case.
-    os.environ.pop("LLM_BASE_URL", None)
-    os.environ.pop("LLM_MODEL", None)
+def test_post_review_missing_llm_config_returns_400(api_client, llm_env):
+    # Base URL and model have defaults; only the missing key should trigger the 400.
+    llm_env("unset")
 
-    r = client.post(
+    r = api_client.post(
         "/review",
         json={"code": "print('hi')\n", "language": "python", "filename": "x.py", "strict": False},
     )
@@ -81,27 +83,19 @@ def test_post_review_missing_llm_config_returns_400(client):
     assert "LLM_API_KEY" in r.text
 
 
-def test_post_review_offline_mode_succeeds_without_llm_config(client):
-    os.environ["LLM_PROVIDER"] = "none"
-    os.environ.pop("LLM_API_KEY", None)
-    os.environ.pop("LLM_BASE_URL", None)
-    os.environ.pop("LLM_MODEL", None)
-
-    r = client.post(
+def test_post_review_offline_mode_succeeds_without_llm_config(api_client, response_json):
+    r = api_client.post(
         "/review",
         json={"code": "print('hi')\n", "language": "python", "filename": "x.py", "strict": False},
     )
     assert r.status_code == 200
-    body = r.json()
+    body = response_json(r)
     assert body["issues"] == []
     assert "static_analysis" in body
 
 
-def test_post_review_strict_mode_returns_formatted_findings(monkeypatch):
-    os.environ["LLM_PROVIDER"] = "openai"
-    os.environ["LLM_API_KEY"] = "test"
-    os.environ["LLM_BASE_URL"] = "http://test"
-    os.environ["LLM_MODEL"] = "test"
+def test_post_review_strict_mode_returns_formatted_findings(api_client, response_json, monkeypatch, llm_env):
+    llm_env("openai")
 
     async def fake_review(self, *, compressed_context: str, static_analysis: dict):
         return [
@@ -122,113 +116,120 @@ def test_post_review_strict_mode_returns_formatted_findings(monkeypatch):
     from app import llm_client
 
     async def review_wrapper(self, *, compressed_context: str, static_analysis: dict, review_prompt: str | None = None):
-        from app.models import Issue
-
         raw = await fake_review(self, compressed_context=compressed_context, static_analysis=static_analysis)
-        return [Issue.model_validate(x) for x in raw]
+        return _ISSUE_LIST.validate_python(raw)
 
     monkeypatch.setattr(llm_client.LLMClient, "review", review_wrapper)
 
-    client = TestClient(app)
-    resp = client.post(
+    resp = api_client.post(
         "/review",
         json={"code": "def foo():\n    x = 10\n    return 5\n", "filename": "t.py", "strict": True},
     )
     assert resp.status_code == 200, resp.text
 
-    data = resp.json()
-    assert "strict_findings" in data
+    # Header lines, labels and block separation, checked on the raw JSON bytes.
+    body = resp.content
+    for fragment in _STRICT_FINDINGS_FRAGMENTS:
+        assert fragment in body, fragment
+
+    data = response_json(resp)
     text = data["strict_findings"]
     assert isinstance(text, str)
 
-    # Exact required header lines and labels.
-    assert "Issue 1\nSeverity: " in text
-    assert "\nCategory: " in text
-    assert "\nProblem: " in text
-    assert "\nSuggestion: " in text
-
-    # Ensure blocks are separated and numbering is stable.
-    assert "Issue 1" in text
-    assert "Issue 2" in text
-    assert "\n\nIssue 2" in text
-
     # Trailing newline (useful for CLI copy/paste friendliness).
     assert text.endswith("\n")
 
 
-def test_post_review_non_python_language_offline_mode_succeeds(client):
-    os.environ["LLM_PROVIDER"] = "none"
-    os.environ.pop("LLM_API_KEY", None)
-    os.environ.pop("LLM_BASE_URL", None)
-    os.environ.pop("LLM_MODEL", None)
-
-    r = client.post(
-        "/review",
+@pytest.mark.parametrize(
+    "url, check_score",
+    [
+        pytest.param("/review", False, id="v1"),
+        pytest.param("/v2/review/file?strict=false", True, id="v2"),
+    ],
+)
+async def test_post_review_non_python_language_offline_mode_succeeds(
+    async_client: httpx.AsyncClient,
+    response_json,
+    url: str,
+    check_score: bool,
+):
+    r = await async_client.post(
+        url,
         json={"code": "console.log('hi')\n", "language": "javascript", "filename": "x.js", "strict": False},
     )
     assert r.status_code == 200
-    body = r.json()
-    assert "issues" in body
-    assert isinstance(body["issues"], list)
-    assert "static_analysis" in body
-    static = body["static_analysis"]
-    assert isinstance(static, dict)
-    # For non-python, python-only tools should be skipped.
-    assert (static.get("flake8") or {}).get("skipped") is True
-    assert (static.get("bandit") or {}).get("skipped") is True
-
-
-def test_post_review_v2_non_python_language_offline_mode_succeeds(client):
-    os.environ["LLM_PROVIDER"] = "none"
-    os.environ.pop("LLM_API_KEY", None)
-    os.environ.pop("LLM_BASE_URL", None)
-    os.environ.pop("LLM_MODEL", None)
-
-    r = client.post(
-        "/v2/review/file?strict=false",
-        json={"code": "console.log('hi')\n", "language": "javascript", "filename": "x.js"},
-    )
-    assert r.status_code == 200
-    body = r.json()
+    body = response_json(r)
     assert "issues" in body and isinstance(body["issues"], list)
-    assert "score" in body and isinstance(body["score"], dict)
-    assert body["score"]["score"] == 100 if not body["issues"] else body["score"]["score"] <= 100
+    if check_score:
+        assert "score" in body and isinstance(body["score"], dict)
+        assert body["score"]["score"] == 100 if not body["issues"] else body["score"]["score"] <= 100
 
     assert "static_analysis" in body and isinstance(body["static_analysis"], dict)
     static = body["static_analysis"]
+    # For non-python, python-only tools should be skipped.
     assert (static.get("flake8") or {}).get("skipped") is True
     assert (static.get("bandit") or {}).get("skipped") is True
-    # eslint is either run (if installed) or explicitly skipped.
-    assert "eslint" in static
+    if check_score:
+        # eslint is either run (if installed) or explicitly skipped.
+        assert "eslint" in static
 
 
-def test_post_review_file_upload_non_python_language_offline_mode_succeeds(client):
-    os.environ["LLM_PROVIDER"] = "none"
-    os.environ.pop("LLM_API_KEY", None)
-    os.environ.pop("LLM_BASE_URL", None)
-    os.environ.pop("LLM_MODEL", None)
-
+def test_post_review_file_upload_non_python_language_offline_mode_succeeds(api_client, response_json):
     files = {"file": ("x.js", b"console.log('hi')\n", "text/javascript")}
-    r = client.post("/review/file", files=files)
+    r = api_client.post("/review/file", files=files)
     assert r.status_code == 200, r.text
-    body = r.json()
+    body = response_json(r)
     assert "issues" in body and isinstance(body["issues"], list)
     static = body.get("static_analysis") or {}
     assert (static.get("flake8") or {}).get("skipped") is True
     assert (static.get("bandit") or {}).get("skipped") is True
 
 
-def test_post_review_file_upload_python_extension_triggers_python_static_tools_offline_mode(client):
-    os.environ["LLM_PROVIDER"] = "none"
-    os.environ.pop("LLM_API_KEY", None)
-    os.environ.pop("LLM_BASE_URL", None)
-    os.environ.pop("LLM_MODEL", None)
-
+def test_post_review_file_upload_python_extension_triggers_python_static_tools_offline_mode(api_client, response_json):
     files = {"file": ("x.py", b"print('hi')\n", "text/x-python")}
-    r = client.post("/review/file", files=files)
+    r = api_client.post("/review/file", files=files)
     assert r.status_code == 200, r.text
-    body = r.json()
+    body = response_json(r)
     static = body.get("static_analysis") or {}
     # flake8/bandit may still be skipped in CI if tools aren't installed,
     # but should at least not force-cast to non-python.
     assert "flake8" in static and "bandit" in static
+
+
+def test_post_review_github_batch_reports_each_path(api_client, response_json, monkeypatch, llm_env):
+    llm_env("openai")
+
+    from app import llm_client, main
+
+    async def review_wrapper(self, *, compressed_context: str, static_analysis: dict, review_prompt: str | None = None):
+        return _ISSUE_LIST.validate_python(
+            [{"severity": "low", "category": "style", "description": "nit", "suggestion": "format"}]
+        )
+
+    class _Raw:
+        def __init__(self, status_code: int, text: str = "") -> None:
+            self.status_code, self.text = status_code, text
+
+    def fake_get(url: str, timeout: float):
+        return _Raw(404) if url.endswith("/missing.py") else _Raw(200, "print('hi')\n")
+
+    monkeypatch.setattr(llm_client.LLMClient, "review", review_wrapper)
+    monkeypatch.setattr(main.requests, "get", fake_get)
+
+    resp = api_client.post(
+        "/review/github/batch",
+        json={"repo_url": "https://github.com/o/r", "paths": ["a.py", "missing.py", "a.py", " "], "ref": "main"},
+    )
+    assert resp.status_code == 200, resp.text
+
+    results = response_json(resp)["results"]
+    assert [r["path"] for r in results] == ["a.py", "missing.py"]
+    assert results[0]["error"] is None and results[0]["review"]["issues"][0]["description"] == "nit"
+    assert results[1]["review"] is None and "HTTP 404" in results[1]["error"]
+
+
+def test_post_review_github_batch_rejects_empty_paths(api_client, llm_env):
+    llm_env("openai")
+
+    r = api_client.post("/review/github/batch", json={"repo_url": "https://github.com/o/r", "paths": []})
+    assert r.status_code == 400
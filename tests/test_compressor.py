@@ -1,8 +1,6 @@
 from app.compressor import compress_python_code
 
-
-def test_compress_strips_docstring_and_comments():
-    code = '''
+_CODE_DOCSTRINGS_AND_COMMENTS = '''
 """module doc"""
 
 # comment
@@ -14,16 +12,8 @@ def f(x: int) -> int:
         return x
     return -x
 '''
-    out = compress_python_code(code).text
-    assert "module doc" not in out
-    assert "# comment" not in out
-    assert '"""doc"""' not in out
-    assert "def f" in out
-    assert "if x > 0" in out
-
 
-def test_compress_emits_imports_and_external_calls():
-    code = """
+_CODE_IMPORTS_AND_CALLS = """
 import os
 from requests import get
 
@@ -33,10 +23,27 @@ def g(url: str):
     print(r)
     return r
 """
-    out = compress_python_code(code).text
+
+
+def test_compress_strips_docstring_and_comments():
+    out = compress_python_code(_CODE_DOCSTRINGS_AND_COMMENTS).text
+    assert "module doc" not in out
+    assert "# comment" not in out
+    assert '"""doc"""' not in out
+    assert "def f" in out
+    assert "if x > 0" in out
+
+
+def test_compress_emits_imports_and_external_calls():
+    out = compress_python_code(_CODE_IMPORTS_AND_CALLS).text
     assert "import os" in out
     assert "from requests import get" in out
     assert "def g(url" in out
     assert "call get" in out
     assert "call os.path.join" in out
     assert "call print" not in out
+
+
+def test_compress_reuses_result_for_identical_input():
+    first = compress_python_code(_CODE_IMPORTS_AND_CALLS)
+    assert compress_python_code(_CODE_IMPORTS_AND_CALLS) is first
@@ -1,20 +1,28 @@
 from __future__ import annotations
 
+from types import MappingProxyType
+
 import pytest
 
 from app.analysis.models import Category
 from app.analysis.pipeline import ReviewPipeline
 
+_DISABLE_SEC_STYLE_PERF = MappingProxyType({"security": False, "style": False, "performance": False})
+_ENABLE_STYLE = MappingProxyType({"style": True})
+
 
 class _NoLLM:
     async def raw_review_json(self, *, review_payload: str) -> str:  # noqa: ARG002
         return '{"issues": []}'
 
 
-@pytest.mark.asyncio
-async def test_enabled_checks_filters_style_and_security_and_performance():
-    pipeline = ReviewPipeline(llm_client=_NoLLM())
+@pytest.fixture(scope="module")
+def pipeline() -> ReviewPipeline:
+    return ReviewPipeline(llm_client=_NoLLM())
 
+
+@pytest.mark.asyncio
+async def test_enabled_checks_filters_style_and_security_and_performance(pipeline: ReviewPipeline):
     # This code intentionally triggers style-ish (deep nesting) in custom rules.
     code = """
 
@@ -33,16 +41,14 @@ def f(x):
         code=code,
         strict=False,
         language="python",
-        enabled_checks={"security": False, "style": False, "performance": False},
+        enabled_checks=_DISABLE_SEC_STYLE_PERF,
     )
 
     assert all(i.category not in {Category.security, Category.style, Category.performance} for i in r.issues)
 
 
 @pytest.mark.asyncio
-async def test_enabled_checks_keeps_style_when_enabled():
-    pipeline = ReviewPipeline(llm_client=_NoLLM())
-
+async def test_enabled_checks_keeps_style_when_enabled(pipeline: ReviewPipeline):
     # Unused import should reliably trigger a flake8 style-like finding.
     code = """
 import os
@@ -56,7 +62,7 @@ def f():
         code=code,
         strict=False,
         language="python",
-        enabled_checks={"style": True},
+        enabled_checks=_ENABLE_STYLE,
     )
 
     assert any(i.category == Category.style for i in r.issues)
@@ -1,13 +1,7 @@
-from fastapi.testclient import TestClient
-
-from app.main import app
-
-
-def test_configz_includes_firebase_status_fields():
-    client = TestClient(app)
-    r = client.get("/configz")
+def test_configz_includes_firebase_status_fields(api_client, response_json):
+    r = api_client.get("/configz")
     assert r.status_code == 200
-    data = r.json()
+    data = response_json(r)
     assert "firebase" in data
     assert "credential_source" in data["firebase"]
     assert "initialized" in data["firebase"]
@@ -15,10 +9,9 @@ def test_configz_includes_firebase_status_fields():
     assert data["firebase"]["initialized"] in (False, True)
 
 
-def test_firebase_debug_endpoint_available_without_auth():
-    client = TestClient(app)
-    r = client.get("/auth/firebase_debug")
+def test_firebase_debug_endpoint_available_without_auth(api_client, response_json):
+    r = api_client.get("/auth/firebase_debug")
     assert r.status_code == 200
-    payload = r.json()
+    payload = response_json(r)
     assert "firebase" in payload
     assert "token_hints" in payload
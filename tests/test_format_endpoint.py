@@ -1,14 +1,8 @@
 from __future__ import annotations
 
-from fastapi.testclient import TestClient
 
-from app.main import app
-
-
-def test_format_endpoint_unknown_language_basic_formatter() -> None:
-    client = TestClient(app)
-
-    resp = client.post(
+def test_format_endpoint_unknown_language_basic_formatter(api_client, response_json) -> None:
+    resp = api_client.post(
         "/v2/format",
         json={
             "code": "a=1  \n\n",
@@ -19,6 +13,6 @@ def test_format_endpoint_unknown_language_basic_formatter() -> None:
 
     # basic formatter should always be available
     assert resp.status_code == 200
-    data = resp.json()
+    data = response_json(resp)
     assert data["formatter"] == "basic"
     assert "a=1" in data["code"]
@@ -1,22 +1,16 @@
-import os
-
 import pytest
 
+_EXPECTED_EXT_MAP_ENTRIES = frozenset({"extByLang", "java: 'java'", "rust: 'rs'", "go: 'go'"})
+
 
-def test_frontend_reviewcode_filename_mapping_mentions_java_extension():
+def test_frontend_reviewcode_filename_mapping_mentions_java_extension(frontend_api_ts_text: str):
     """Regression test for the bug where the frontend sent filename=input.java.
 
     The frontend can't infer the public class name, but it must at least use the
     correct language extension mapping rather than `input.${language}`.
     """
-    path = os.path.join(os.path.dirname(__file__), os.pardir, "frontend", "client", "services", "api.ts")
-    with open(path, "r", encoding="utf-8") as f:
-        txt = f.read()
-
-    assert "extByLang" in txt
-    assert "java: 'java'" in txt
-    assert "rust: 'rs'" in txt
-    assert "go: 'go'" in txt
+    missing = {s for s in _EXPECTED_EXT_MAP_ENTRIES if s not in frontend_api_ts_text}
+    assert not missing
 
 
 @pytest.mark.parametrize(
@@ -30,9 +24,7 @@ def test_frontend_reviewcode_filename_mapping_mentions_java_extension():
         ("rust", "rs"),
     ],
 )
-def test_frontend_language_map_contains_expected_extensions(language: str, expected_ext: str):
-    path = os.path.join(os.path.dirname(__file__), os.pardir, "frontend", "client", "services", "api.ts")
-    with open(path, "r", encoding="utf-8") as f:
-        txt = f.read()
-
-    assert f"{language}: '{expected_ext}'" in txt
+def test_frontend_language_map_contains_expected_extensions(
+    frontend_api_ts_text: str, language: str, expected_ext: str
+):
+    assert f"{language}: '{expected_ext}'" in frontend_api_ts_text
@@ -0,0 +1,17 @@
+import pytest
+
+
+@pytest.mark.parametrize("path", ["/healthz", "/configz"])
+def test_status_endpoint_answers_matching_etag_with_304(api_client, response_json, path: str):
+    r = api_client.get(path)
+    assert r.status_code == 200
+    etag = r.headers["etag"]
+
+    again = api_client.get(path, headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == etag
+
+    stale = api_client.get(path, headers={"If-None-Match": '"stale"'})
+    assert stale.status_code == 200
+    assert response_json(stale) == response_json(r)
@@ -1,35 +1,34 @@
+import asyncio
 import json
+from collections.abc import Callable, Iterator
 
 import httpx
 import pytest
 
 from app.llm_client import request_llm_review
 
+_Handler = Callable[[httpx.Request], httpx.Response]
 
-def _mock_transport(payload: dict, status_code: int = 200) -> httpx.MockTransport:
-    def handler(request: httpx.Request) -> httpx.Response:
-        assert request.method == "POST"
-        assert request.url.path.endswith("/chat/completions")
-        return httpx.Response(status_code, json=payload)
+# Payloads are encoded once to bytes and served with content=, skipping httpx's own json= encoding per request.
+_ENC = json.JSONEncoder(separators=(",", ":"))
+_JSON_HEADERS = {"content-type": "application/json"}
 
-    return httpx.MockTransport(handler)
 
+def _encode(obj: object) -> bytes:
+    return _ENC.encode(obj).encode("utf-8")
 
-def _mock_transport_assert_user_content(
-    expected_substring: str, payload: dict, status_code: int = 200
-) -> httpx.MockTransport:
-    def handler(request: httpx.Request) -> httpx.Response:
-        body = json.loads(request.content.decode("utf-8"))
-        assert body["messages"][1]["role"] == "user"
-        assert expected_substring in body["messages"][1]["content"]
-        return httpx.Response(status_code, json=payload)
 
-    return httpx.MockTransport(handler)
+def _payload(content: str) -> bytes:
+    return _encode({"choices": [{"message": {"content": content}}]})
 
 
-@pytest.mark.asyncio
-async def test_request_llm_review_happy_path():
-    llm_content = json.dumps(
+def _json_response(status_code: int, body: bytes) -> httpx.Response:
+    return httpx.Response(status_code, content=body, headers=_JSON_HEADERS)
+
+
+_EMPTY_ISSUES = _payload(_ENC.encode({"issues": []}))
+_HAPPY_PAYLOAD = _payload(
+    _ENC.encode(
         {
             "issues": [
                 {
@@ -42,344 +41,303 @@ async def test_request_llm_review_happy_path():
             ]
         }
     )
+)
+_UNAUTHORIZED = _encode({"error": {"message": "unauthorized"}})
+_RATE_LIMITED = _encode({"error": {"message": "rate limited"}})
 
-    payload = {"choices": [{"message": {"content": llm_content}}]}
-    transport = _mock_transport(payload)
 
-    async with httpx.AsyncClient(transport=transport, base_url="https://example.com/v1") as client:
-        issues = await request_llm_review(
-            api_key="k",
-            base_url="https://example.com/v1",
-            model="gpt",
-            compressed_context="def f(): pass",
-            static_analysis={"flake8": {}, "bandit": {}},
-            client=client,
-        )
+class _MockLLMServer:
+    """Single MockTransport handler for the shared client; each test installs the response it needs."""
 
-    assert len(issues) >= 1
-    assert issues[0].severity.value == "high"
-    assert issues[0].category.value == "security"
+    def __init__(self) -> None:
+        self._handler: _Handler | None = None
 
+    def respond_with(self, handler: _Handler) -> None:
+        self._handler = handler
 
-@pytest.mark.asyncio
-async def test_request_llm_review_non_json_content():
-    payload = {"choices": [{"message": {"content": "not json"}}]}
-    transport = _mock_transport(payload)
-
-    async with httpx.AsyncClient(transport=transport, base_url="https://example.com/v1") as client:
-        issues = await request_llm_review(
-            api_key="k",
-            base_url="https://example.com/v1",
-            model="gpt",
-            compressed_context="x",
-            static_analysis={},
-            client=client,
-        )
+    def reset(self) -> None:
+        self._handler = None
 
-    assert len(issues) == 1
-    assert issues[0].severity.value == "high"
-    assert "non-JSON" in issues[0].description
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        assert self._handler is not None, "test did not install a mock response"
+        return self._handler(request)
 
 
-@pytest.mark.asyncio
-async def test_request_llm_review_drops_invalid_items():
-    # First item is missing required fields; second one is valid.
-    llm_content = json.dumps(
-        {
-            "issues": [
-                {"severity": "medium", "category": "bug"},
-                {
-                    "severity": "low",
-                    "category": "style",
-                    "description": "Minor style nit",
-                    "suggestion": "Run black/ruff.",
-                },
-            ]
-        }
-    )
+_MOCK_LLM = _MockLLMServer()
 
-    payload = {"choices": [{"message": {"content": llm_content}}]}
-    transport = _mock_transport(payload)
 
-    async with httpx.AsyncClient(transport=transport, base_url="https://example.com/v1") as client:
-        issues = await request_llm_review(
-            api_key="k",
-            base_url="https://example.com/v1",
-            model="gpt",
-            compressed_context="x",
-            static_analysis={},
-            client=client,
-        )
+@pytest.fixture(autouse=True)
+def _reset_mock_llm() -> Iterator[None]:
+    # The handler is module state: clear it so a test that installs none fails instead of reusing the last one.
+    _MOCK_LLM.reset()
+    yield
+    _MOCK_LLM.reset()
 
-    # Should keep the valid one, and append a low-severity note about dropped items.
-    assert any(i.description == "Minor style nit" for i in issues)
-    assert any("dropped" in (i.metadata or {}) for i in issues)
 
+@pytest.fixture(scope="session")
+def shared_client() -> Iterator[httpx.AsyncClient]:
+    # A sync fixture on purpose: async fixtures from the pinned pytest-asyncio don't run under pytest 8.4.
+    # Building an AsyncClient needs no running loop, and MockTransport holds no sockets.
+    client = httpx.AsyncClient(transport=httpx.MockTransport(_MOCK_LLM), base_url="https://example.com/v1")
+    yield client
+    asyncio.run(client.aclose())
 
-@pytest.mark.asyncio
-async def test_request_llm_review_http_401_has_actionable_suggestion():
-    payload = {
-        "error": {
-            "message": "Incorrect API key provided",
-            "type": "invalid_request_error",
-            "code": "invalid_api_key",
-        }
-    }
-    transport = _mock_transport(payload, status_code=401)
-
-    async with httpx.AsyncClient(transport=transport, base_url="https://example.com/v1") as client:
-        issues = await request_llm_review(
-            api_key="sk-not-a-real-key",
-            base_url="https://example.com/v1",
-            model="gpt",
-            compressed_context="x",
-            static_analysis={},
-            client=client,
-        )
 
-    assert issues == []
+def _mock_handler(payload: bytes, status_code: int = 200) -> _Handler:
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.method == "POST"
+        assert request.url.path.endswith("/chat/completions")
+        return _json_response(status_code, payload)
 
+    return handler
 
-@pytest.mark.asyncio
-async def test_request_llm_review_uses_review_prompt_override():
-    llm_content = json.dumps(
-        {
-            "issues": [
-                {
-                    "severity": "low",
-                    "category": "style",
-                    "description": "nit",
-                    "suggestion": "format",
-                }
-            ]
-        }
-    )
 
-    payload = {"choices": [{"message": {"content": llm_content}}]}
+def _mock_handler_assert_user_content(expected_substring: str, payload: bytes, status_code: int = 200) -> _Handler:
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content.decode("utf-8"))
+        assert body["messages"][1]["role"] == "user"
+        assert expected_substring in body["messages"][1]["content"]
+        return _json_response(status_code, payload)
 
-    override_prompt = "THIS IS THE OVERRIDDEN REVIEW PROMPT"
-    transport = _mock_transport_assert_user_content(override_prompt, payload)
-
-    async with httpx.AsyncClient(transport=transport, base_url="https://example.com/v1") as client:
-        issues = await request_llm_review(
-            api_key="k",
-            base_url="https://example.com/v1",
-            model="gpt",
-            compressed_context="x",
-            static_analysis={},
-            review_prompt=override_prompt,
-            client=client,
-        )
+    return handler
 
-    assert len(issues) == 1
-    assert issues[0].description == "nit"
+
+def set_mock_response(payload: bytes, status_code: int = 200) -> None:
+    _MOCK_LLM.respond_with(_mock_handler(payload, status_code))
+
+
+_TYPED_ADD_WITH_DOCSTRING = (
+    'def add(a: int, b: int) -> int:\n    """Return the sum of two integers."""\n    return a + b\n'
+)
+
+
+def _style_nit(description: str, suggestion: str) -> str:
+    return _ENC.encode(
+        {"issues": [{"severity": "low", "category": "style", "description": description, "suggestion": suggestion}]}
+    )
 
 
 @pytest.mark.asyncio
-async def test_request_llm_review_allows_empty_issues_list():
-    llm_content = json.dumps({"issues": []})
-    payload = {"choices": [{"message": {"content": llm_content}}]}
-    transport = _mock_transport(payload)
-
-    async with httpx.AsyncClient(transport=transport, base_url="https://example.com/v1") as client:
-        issues = await request_llm_review(
-            api_key="k",
-            base_url="https://example.com/v1",
-            model="gpt",
-            compressed_context="def add(a: int, b: int) -> int: return a + b",
-            static_analysis={},
-            client=client,
-        )
+async def test_request_llm_review_happy_path(shared_client: httpx.AsyncClient):
+    set_mock_response(_HAPPY_PAYLOAD)
+
+    issues = await request_llm_review(
+        api_key="k",
+        base_url="https://example.com/v1",
+        model="gpt",
+        compressed_context="def f(): pass",
+        static_analysis={"flake8": {}, "bandit": {}},
+        client=shared_client,
+    )
 
-    assert issues == []
+    assert len(issues) >= 1
+    assert issues[0].severity.value == "high"
+    assert issues[0].category.value == "security"
 
 
 @pytest.mark.asyncio
-async def test_request_llm_review_filters_no_issue_placeholder():
-    llm_content = json.dumps(
-        {
-            "issues": [
-                {
-                    "severity": "low",
-                    "category": "style",
-                    "description": "No issues found.",
-                    "suggestion": "Review completed.",
-                }
-            ]
-        }
+async def test_request_llm_review_non_json_content(shared_client: httpx.AsyncClient):
+    set_mock_response(_payload("not json"))
+
+    issues = await request_llm_review(
+        api_key="k",
+        base_url="https://example.com/v1",
+        model="gpt",
+        compressed_context="x",
+        static_analysis={},
+        client=shared_client,
     )
-    payload = {"choices": [{"message": {"content": llm_content}}]}
-    transport = _mock_transport(payload)
-
-    async with httpx.AsyncClient(transport=transport, base_url="https://example.com/v1") as client:
-        issues = await request_llm_review(
-            api_key="k",
-            base_url="https://example.com/v1",
-            model="gpt",
-            compressed_context="x",
-            static_analysis={},
-            client=client,
-        )
 
-    assert issues == []
+    assert len(issues) == 1
+    assert issues[0].severity.value == "high"
+    assert "non-JSON" in issues[0].description
 
 
 @pytest.mark.asyncio
-async def test_request_llm_review_filters_docstring_missing_claim_when_docstring_present():
-    llm_content = json.dumps(
+async def test_request_llm_review_drops_invalid_items(shared_client: httpx.AsyncClient):
+    # First item is missing required fields; second one is valid.
+    llm_content = _ENC.encode(
         {
             "issues": [
+                {"severity": "medium", "category": "bug"},
                 {
                     "severity": "low",
                     "category": "style",
-                    "description": "The function add(a, b) -> int does not include any documentation or comments.",
-                    "suggestion": "Add a docstring.",
-                }
+                    "description": "Minor style nit",
+                    "suggestion": "Run black/ruff.",
+                },
             ]
         }
     )
-    payload = {"choices": [{"message": {"content": llm_content}}]}
-    transport = _mock_transport(payload)
 
-    code = 'def add(a: int, b: int) -> int:\n    """Return the sum of two integers."""\n    return a + b\n'
+    set_mock_response(_payload(llm_content))
 
-    async with httpx.AsyncClient(transport=transport, base_url="https://example.com/v1") as client:
-        issues = await request_llm_review(
-            api_key="k",
-            base_url="https://example.com/v1",
-            model="gpt",
-            compressed_context=code,
-            static_analysis={},
-            client=client,
-        )
+    issues = await request_llm_review(
+        api_key="k",
+        base_url="https://example.com/v1",
+        model="gpt",
+        compressed_context="x",
+        static_analysis={},
+        client=shared_client,
+    )
 
-    assert issues == []
+    # Should keep the valid one, and append a low-severity note about dropped items.
+    assert any(i.description == "Minor style nit" for i in issues)
+    assert any("dropped" in (i.metadata or {}) for i in issues)
 
 
 @pytest.mark.asyncio
-async def test_request_llm_review_filters_generic_error_handling_nit_for_typed_add():
-    llm_content = json.dumps(
+async def test_request_llm_review_http_401_has_actionable_suggestion(shared_client: httpx.AsyncClient):
+    payload = _encode(
         {
-            "issues": [
-                {
-                    "severity": "low",
-                    "category": "style",
-                    "description": "The function add(a, b) -> int does not include any error checking or handling for non-integer inputs.",
-                    "suggestion": "Add type checks.",
-                }
-            ]
+            "error": {
+                "message": "Incorrect API key provided",
+                "type": "invalid_request_error",
+                "code": "invalid_api_key",
+            }
         }
     )
-    payload = {"choices": [{"message": {"content": llm_content}}]}
-    transport = _mock_transport(payload)
-
-    code = 'def add(a: int, b: int) -> int:\n    """Return the sum of two integers."""\n    return a + b\n'
-
-    async with httpx.AsyncClient(transport=transport, base_url="https://example.com/v1") as client:
-        issues = await request_llm_review(
-            api_key="k",
-            base_url="https://example.com/v1",
-            model="gpt",
-            compressed_context=code,
-            static_analysis={},
-            client=client,
-        )
+    set_mock_response(payload, status_code=401)
+
+    issues = await request_llm_review(
+        api_key="sk-not-a-real-key",
+        base_url="https://example.com/v1",
+        model="gpt",
+        compressed_context="x",
+        static_analysis={},
+        client=shared_client,
+    )
 
     assert issues == []
 
 
 @pytest.mark.asyncio
-async def test_request_llm_review_filters_generic_naming_nit_for_add():
-    llm_content = json.dumps(
-        {
-            "issues": [
-                {
-                    "severity": "low",
-                    "category": "style",
-                    "description": "The function add uses a simple and clear name, but it may be beneficial to consider using a more descriptive name to improve readability.",
-                    "suggestion": "Review completed.",
-                }
-            ]
-        }
+async def test_request_llm_review_uses_review_prompt_override(shared_client: httpx.AsyncClient):
+    payload = _payload(_style_nit("nit", "format"))
+
+    override_prompt = "THIS IS THE OVERRIDDEN REVIEW PROMPT"
+    _MOCK_LLM.respond_with(_mock_handler_assert_user_content(override_prompt, payload))
+
+    issues = await request_llm_review(
+        api_key="k",
+        base_url="https://example.com/v1",
+        model="gpt",
+        compressed_context="x",
+        static_analysis={},
+        review_prompt=override_prompt,
+        client=shared_client,
     )
-    payload = {"choices": [{"message": {"content": llm_content}}]}
-    transport = _mock_transport(payload)
 
-    code = 'def add(a: int, b: int) -> int:\n    """Return the sum of two integers."""\n    return a + b\n'
+    assert len(issues) == 1
+    assert issues[0].description == "nit"
 
-    async with httpx.AsyncClient(transport=transport, base_url="https://example.com/v1") as client:
-        issues = await request_llm_review(
-            api_key="k",
-            base_url="https://example.com/v1",
-            model="gpt",
-            compressed_context=code,
-            static_analysis={},
-            client=client,
-        )
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "llm_content, code",
+    [
+        pytest.param(
+            _ENC.encode({"issues": []}),
+            "def add(a: int, b: int) -> int: return a + b",
+            id="empty-issues-list",
+        ),
+        pytest.param(
+            _style_nit("No issues found.", "Review completed."),
+            "x",
+            id="no-issue-placeholder",
+        ),
+        pytest.param(
+            _style_nit(
+                "The function add(a, b) -> int does not include any documentation or comments.",
+                "Add a docstring.",
+            ),
+            _TYPED_ADD_WITH_DOCSTRING,
+            id="docstring-missing-claim-with-docstring",
+        ),
+        pytest.param(
+            _style_nit(
+                "The function add(a, b) -> int does not include any error checking or handling for non-integer inputs.",
+                "Add type checks.",
+            ),
+            _TYPED_ADD_WITH_DOCSTRING,
+            id="generic-error-handling-nit-for-typed-add",
+        ),
+        pytest.param(
+            _style_nit(
+                "The function add uses a simple and clear name, but it may be beneficial to consider using a more descriptive name to improve readability.",
+                "Review completed.",
+            ),
+            _TYPED_ADD_WITH_DOCSTRING,
+            id="generic-naming-nit-for-add",
+        ),
+    ],
+)
+async def test_request_llm_review_returns_no_issues(shared_client: httpx.AsyncClient, llm_content: str, code: str):
+    set_mock_response(_payload(llm_content))
+
+    issues = await request_llm_review(
+        api_key="k",
+        base_url="https://example.com/v1",
+        model="gpt",
+        compressed_context=code,
+        static_analysis={},
+        client=shared_client,
+    )
 
     assert issues == []
 
 
 @pytest.mark.asyncio
-async def test_request_llm_review_returns_empty_on_http_401(monkeypatch):
+async def test_request_llm_review_returns_empty_on_http_401(shared_client: httpx.AsyncClient, monkeypatch):
     # Avoid real sleeping during backoff.
     async def _no_sleep(_seconds: float):
         return None
 
-    import asyncio as _asyncio
-
-    monkeypatch.setattr(_asyncio, "sleep", _no_sleep)
+    monkeypatch.setattr(asyncio, "sleep", _no_sleep)
 
     def handler(request: httpx.Request) -> httpx.Response:
-        return httpx.Response(401, json={"error": {"message": "unauthorized"}})
+        return _json_response(401, _UNAUTHORIZED)
 
-    transport = httpx.MockTransport(handler)
+    _MOCK_LLM.respond_with(handler)
 
-    async with httpx.AsyncClient(transport=transport, base_url="https://example.com/v1") as client:
-        issues = await request_llm_review(
-            api_key="k",
-            base_url="https://example.com/v1",
-            model="gpt",
-            compressed_context="x",
-            static_analysis={},
-            client=client,
-        )
+    issues = await request_llm_review(
+        api_key="k",
+        base_url="https://example.com/v1",
+        model="gpt",
+        compressed_context="x",
+        static_analysis={},
+        client=shared_client,
+    )
 
     assert issues == []
 
 
 @pytest.mark.asyncio
-async def test_request_llm_review_retries_on_429_then_succeeds(monkeypatch):
+async def test_request_llm_review_retries_on_429_then_succeeds(shared_client: httpx.AsyncClient, monkeypatch):
     # Avoid real sleeping during backoff.
     async def _no_sleep(_seconds: float):
         return None
 
-    import asyncio as _asyncio
-
-    monkeypatch.setattr(_asyncio, "sleep", _no_sleep)
-
-    llm_content = json.dumps({"issues": []})
-    ok_payload = {"choices": [{"message": {"content": llm_content}}]}
+    monkeypatch.setattr(asyncio, "sleep", _no_sleep)
 
     state = {"calls": 0}
 
     def handler(request: httpx.Request) -> httpx.Response:
         state["calls"] += 1
         if state["calls"] < 3:
-            return httpx.Response(429, json={"error": {"message": "rate limited"}}, headers={"retry-after": "0"})
-        return httpx.Response(200, json=ok_payload)
-
-    transport = httpx.MockTransport(handler)
-
-    async with httpx.AsyncClient(transport=transport, base_url="https://example.com/v1") as client:
-        issues = await request_llm_review(
-            api_key="k",
-            base_url="https://example.com/v1",
-            model="gpt",
-            compressed_context="x",
-            static_analysis={},
-            client=client,
-        )
+            return httpx.Response(429, content=_RATE_LIMITED, headers={**_JSON_HEADERS, "retry-after": "0"})
+        return _json_response(200, _EMPTY_ISSUES)
+
+    _MOCK_LLM.respond_with(handler)
+
+    issues = await request_llm_review(
+        api_key="k",
+        base_url="https://example.com/v1",
+        model="gpt",
+        compressed_context="x",
+        static_analysis={},
+        client=shared_client,
+    )
 
     assert issues == []
     assert state["calls"] == 3
@@ -1,42 +1,44 @@
+import pytest
+
 from app.models import Category, Issue, Severity
 from app.ranker import rank_issues
 
 
-def test_rank_orders_by_severity_then_category():
-    issues = [
-        Issue(severity=Severity.low, category=Category.security, description="a", suggestion="x"),
-        Issue(severity=Severity.high, category=Category.style, description="b", suggestion="x"),
-        Issue(severity=Severity.high, category=Category.security, description="c", suggestion="x"),
-    ]
-
-    ranked = rank_issues(issues)
-    assert ranked[0].severity == Severity.high and ranked[0].category == Category.security
-    assert ranked[1].severity == Severity.high and ranked[1].category == Category.style
-
-
-def test_rank_category_priority_within_same_severity():
-    issues = [
-        Issue(severity=Severity.medium, category=Category.style, description="s", suggestion="x"),
-        Issue(severity=Severity.medium, category=Category.performance, description="p", suggestion="x"),
-        Issue(severity=Severity.medium, category=Category.bug, description="b", suggestion="x"),
-        Issue(severity=Severity.medium, category=Category.security, description="sec", suggestion="x"),
+@pytest.fixture(scope="module")
+def issue_bank() -> dict[str, Issue]:
+    # Built once per module; rank_issues returns a new list and never mutates the issues.
+    specs = [
+        ("l-sec", Severity.low, Category.security),
+        ("h-style", Severity.high, Category.style),
+        ("h-sec", Severity.high, Category.security),
+        ("m-style", Severity.medium, Category.style),
+        ("m-perf", Severity.medium, Category.performance),
+        ("m-bug", Severity.medium, Category.bug),
+        ("m-sec", Severity.medium, Category.security),
     ]
-
-    ranked = rank_issues(issues)
-    assert [i.category for i in ranked] == [
-        Category.security,
-        Category.bug,
-        Category.performance,
-        Category.style,
-    ]
-
-
-def test_rank_severity_always_beats_category():
-    issues = [
-        Issue(severity=Severity.medium, category=Category.style, description="m-style", suggestion="x"),
-        Issue(severity=Severity.low, category=Category.security, description="l-sec", suggestion="x"),
-    ]
-
-    ranked = rank_issues(issues)
-    assert ranked[0].severity == Severity.medium
-    assert ranked[1].severity == Severity.low
+    return {d: Issue(severity=sev, category=cat, description=d, suggestion="x") for d, sev, cat in specs}
+
+
+@pytest.mark.parametrize(
+    "given, expected",
+    [
+        pytest.param(
+            ["l-sec", "h-style", "h-sec"],
+            ["h-sec", "h-style", "l-sec"],
+            id="severity-then-category",
+        ),
+        pytest.param(
+            ["m-style", "m-perf", "m-bug", "m-sec"],
+            ["m-sec", "m-bug", "m-perf", "m-style"],
+            id="category-priority-within-same-severity",
+        ),
+        pytest.param(
+            ["m-style", "l-sec"],
+            ["m-style", "l-sec"],
+            id="severity-always-beats-category",
+        ),
+    ],
+)
+def test_rank_issues_order(issue_bank: dict[str, Issue], given: list[str], expected: list[str]):
+    ranked = rank_issues([issue_bank[d] for d in given])
+    assert [i.description for i in ranked] == expected
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import gzip
+import json
+
+import pytest
+
+from app.request_decompression import _BodyTooLarge, _gunzip
+
+_FORMAT_BODY = json.dumps({"code": "a=1  \n\n", "language": "unknownlang", "filename": "x.unknownlang"}).encode()
+
+
+def test_gzip_encoded_body_reaches_endpoint_as_json(api_client, response_json) -> None:
+    resp = api_client.post(
+        "/v2/format",
+        content=gzip.compress(_FORMAT_BODY, compresslevel=1),
+        headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+    )
+
+    assert resp.status_code == 200
+    assert response_json(resp)["formatter"] == "basic"
+
+
+def test_configz_advertises_gzip_request_encoding(api_client, response_json) -> None:
+    assert "gzip" in response_json(api_client.get("/configz"))["request_encodings"]
+
+
+def test_malformed_gzip_body_is_rejected(api_client) -> None:
+    resp = api_client.post(
+        "/v2/format",
+        content=b"not gzip",
+        headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+    )
+
+    assert resp.status_code == 400
+
+
+@pytest.mark.parametrize("limit, ok", [(len(_FORMAT_BODY), True), (len(_FORMAT_BODY) - 1, False)])
+def test_gunzip_enforces_decompressed_size_limit(limit: int, ok: bool) -> None:
+    data = gzip.compress(_FORMAT_BODY)
+    if ok:
+        assert _gunzip(data, limit=limit) == _FORMAT_BODY
+    else:
+        with pytest.raises(_BodyTooLarge):
+            _gunzip(data, limit=limit)
@@ -2,13 +2,42 @@
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock, patch
+from collections.abc import Callable
 
 import httpx
+import pytest
 
+from app import scaledown_compression
 from app.scaledown_compression import compress_with_scaledown
 
 
+@pytest.fixture()
+def scaledown_server(monkeypatch):
+    """Route the module's pooled client through an httpx.MockTransport; returns the requests it saw."""
+    seen: list[httpx.Request] = []
+
+    def _install(handler: Callable[[httpx.Request], httpx.Response]) -> list[httpx.Request]:
+        def _record(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            return handler(request)
+
+        client = httpx.Client(transport=httpx.MockTransport(_record))
+        monkeypatch.setattr(scaledown_compression, "_get_client", lambda: client)
+        return seen
+
+    return _install
+
+
+@pytest.fixture(params=[None, "true"], ids=["enabled-unset", "enabled-true"])
+def scaledown_enabled(request, monkeypatch):
+    """Run a test with SCALEDOWN_ENABLED both unset and explicitly on; both must behave the same."""
+    monkeypatch.setenv("SCALEDOWN_API_KEY", "k")
+    if request.param is None:
+        monkeypatch.delenv("SCALEDOWN_ENABLED", raising=False)
+    else:
+        monkeypatch.setenv("SCALEDOWN_ENABLED", request.param)
+
+
 def test_no_api_key_returns_original_prompt(monkeypatch):
     monkeypatch.delenv("SCALEDOWN_API_KEY", raising=False)
     monkeypatch.delenv("SCALEDOWN_ENABLED", raising=False)
@@ -18,14 +47,14 @@ def test_no_api_key_returns_original_prompt(monkeypatch):
     assert used is False
 
 
-def test_scaledown_disabled_env_var_forces_noop(monkeypatch):
+def test_scaledown_disabled_env_var_forces_noop(monkeypatch, scaledown_server):
     monkeypatch.setenv("SCALEDOWN_API_KEY", "k")
     monkeypatch.setenv("SCALEDOWN_ENABLED", "false")
 
     # Even if ScaleDown would succeed, we should never call it when disabled.
-    with patch("httpx.Client") as client_cls:
-        out, used = compress_with_scaledown("ORIGINAL")
-        client_cls.assert_not_called()
+    seen = scaledown_server(lambda request: httpx.Response(200, json={"compressed": "COMPRESSED"}))
+    out, used = compress_with_scaledown("ORIGINAL")
+    assert seen == []
 
     assert out == "ORIGINAL"
     assert used is False
@@ -39,39 +68,27 @@ def test_empty_prompt_returns_empty(monkeypatch):
     assert used is False
 
 
-def test_successful_compression(monkeypatch):
-    monkeypatch.setenv("SCALEDOWN_API_KEY", "k")
-    monkeypatch.delenv("SCALEDOWN_ENABLED", raising=False)
-
-    mock_resp = MagicMock()
-    mock_resp.raise_for_status = MagicMock()
-    mock_resp.json.return_value = {"compressed": "COMPRESSED"}
+@pytest.mark.usefixtures("scaledown_enabled")
+def test_successful_compression(scaledown_server):
+    seen = scaledown_server(lambda request: httpx.Response(200, json={"compressed": "COMPRESSED"}))
 
-    with patch("httpx.Client") as client_cls:
-        client = MagicMock()
-        client.__enter__.return_value = client
-        client.__exit__.return_value = None
-        client.post.return_value = mock_resp
-        client_cls.return_value = client
+    out, used = compress_with_scaledown("ORIGINAL")
 
-        out, used = compress_with_scaledown("ORIGINAL")
+    assert len(seen) == 1
+    assert seen[0].headers["x-api-key"] == "k"
 
     assert out == "COMPRESSED"
     assert used is True
 
 
-def test_failure_falls_back(monkeypatch):
-    monkeypatch.setenv("SCALEDOWN_API_KEY", "k")
-    monkeypatch.delenv("SCALEDOWN_ENABLED", raising=False)
+@pytest.mark.usefixtures("scaledown_enabled")
+def test_failure_falls_back(scaledown_server):
+    def _refuse(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("nope", request=request)
 
-    with patch("httpx.Client") as client_cls:
-        client = MagicMock()
-        client.__enter__.return_value = client
-        client.__exit__.return_value = None
-        client.post.side_effect = httpx.ConnectError("nope")
-        client_cls.return_value = client
+    scaledown_server(_refuse)
 
-        out, used = compress_with_scaledown("ORIGINAL")
+    out, used = compress_with_scaledown("ORIGINAL")
 
     assert out == "ORIGINAL"
     assert used is False
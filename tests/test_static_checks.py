@@ -1,14 +1,20 @@
 import json
 import os
-import subprocess
 import tempfile
 
 import pytest
 
-from app.static_checks import run_static_analysis, run_static_analysis_on_file
+from app.static_checks import clear_static_analysis_cache, run_static_analysis, run_static_analysis_on_file
 
 
-def test_static_checks_return_shapes():
+@pytest.fixture(autouse=True)
+def _fresh_static_cache():
+    # Several tests fake subprocess.run; a memoized real run of the same snippet would bypass the fake.
+    clear_static_analysis_cache()
+
+
+def test_static_checks_return_shapes(fake_flake8_run):
+    fake_flake8_run(stdout="t.py|1|1|F821|undefined name 'prin'\n", returncode=1)
     code = "def add(a,b):\n    return a+b\n"
     res = run_static_analysis(code=code, filename="t.py")
     assert "exit_code" in res.flake8
@@ -17,7 +23,8 @@ def test_static_checks_return_shapes():
     assert "result" in res.bandit
 
 
-def test_static_checks_on_file_returns_json_serializable_dict():
+def test_static_checks_on_file_returns_json_serializable_dict(fake_flake8_run):
+    fake_flake8_run(stdout="sample.py|1|1|F821|undefined name 'prin'\n", returncode=1)
     with tempfile.TemporaryDirectory() as tmp:
         path = os.path.join(tmp, "sample.py")
         with open(path, "w", encoding="utf-8") as f:
@@ -52,41 +59,48 @@ def test_static_checks_flags_undefined_name_typo():
     assert any(i.get("code") == "F821" for i in issues)
 
 
-def test_flake8_parsing_windows_drive_letter_paths(monkeypatch):
-    from app.static_checks import run_static_analysis
+@pytest.mark.integration
+def test_inproc_linters_match_subprocess_results(monkeypatch):
+    code = "import subprocess\n\ndef f(x):\n    return eval(x)\n"
+
+    monkeypatch.delenv("CODE_REVIEW_INPROC_LINTERS", raising=False)
+    sub = run_static_analysis(code=code, filename="t.py")
+    monkeypatch.setenv("CODE_REVIEW_INPROC_LINTERS", "1")
+    inproc = run_static_analysis(code=code, filename="t.py")
+
+    def _flake8_keys(res):
+        return [(i["row"], i["col"], i["code"]) for i in res.flake8["issues"]]
 
-    class _P:
-        def __init__(self) -> None:
-            self.returncode = 1
-            self.stdout = r"C:\\tmp\\input.py|1|1|F821|undefined name 'prin'\n"
-            self.stderr = ""
+    def _bandit_keys(res):
+        return [(r["test_id"], r["line_number"]) for r in res.bandit["result"]["results"]]
 
-    def _fake_run(*args, **kwargs):
-        return _P()
+    assert _flake8_keys(inproc) == _flake8_keys(sub)
+    assert _bandit_keys(inproc) == _bandit_keys(sub)
+    assert inproc.flake8["exit_code"] == sub.flake8["exit_code"]
+    assert inproc.bandit["exit_code"] == sub.bandit["exit_code"]
 
-    monkeypatch.setattr(subprocess, "run", _fake_run)
+
+@pytest.mark.parametrize(
+    "raw_path",
+    [
+        pytest.param(r"C:\tmp\input.py", id="windows-drive"),
+        pytest.param("/tmp/input.py", id="posix"),
+        pytest.param(r"\\server\share\input.py", id="windows-unc"),
+    ],
+)
+def test_flake8_parsing_keeps_path_intact(fake_flake8_run, raw_path: str):
+    fake_flake8_run(stdout=f"{raw_path}|1|1|F821|undefined name 'prin'\n", returncode=1)
 
     res = run_static_analysis(code='prin("hello")\n', filename="input.py")
     issues = res.flake8.get("issues") or []
-    assert any(i.get("code") == "F821" for i in issues)
+    assert any(i.get("code") == "F821" and i.get("path") == raw_path and i.get("row") == 1 for i in issues)
 
 
-def test_builtin_fallback_does_not_flag_module_dunder_name(monkeypatch):
+def test_builtin_fallback_does_not_flag_module_dunder_name(fake_flake8_run):
     """Regression: the built-in undefined-name fallback must not flag `__name__`."""
 
-    from app.static_checks import run_static_analysis
-
     # Force flake8 to return no issues so the builtin fallback runs.
-    class _P:
-        def __init__(self) -> None:
-            self.returncode = 0
-            self.stdout = ""
-            self.stderr = ""
-
-    def _fake_run(*args, **kwargs):
-        return _P()
-
-    monkeypatch.setattr(subprocess, "run", _fake_run)
+    fake_flake8_run()
 
     code = """\
 if __name__ == "__main__":
@@ -96,3 +110,14 @@ if __name__ == "__main__":
     res = run_static_analysis(code=code, filename="input.py")
     issues = res.flake8.get("issues") or []
     assert not any(i.get("code") == "F821" and "__name__" in (i.get("message") or "") for i in issues)
+
+
+def test_run_static_analysis_memoizes_successful_runs(fake_flake8_run):
+    calls = fake_flake8_run()
+
+    first = run_static_analysis(code="x = 1\n", filename="input.py")
+    first.flake8["issues"].append({"code": "X000"})
+    second = run_static_analysis(code="x = 1\n", filename="input.py")
+
+    assert len(calls) == 2  # one flake8 + one bandit spawn, for the first call only
+    assert second.flake8["issues"] == []
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterator
+from types import ModuleType, SimpleNamespace
+
+import pytest
+import requests
+
+_REMOTE = "https://api.example.test"
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture()
+def health_probe(ui: ModuleType, monkeypatch: pytest.MonkeyPatch) -> Iterator[SimpleNamespace]:
+    """Fresh backoff state, a manual clock, no jitter, and a /healthz GET that always fails.
+
+    Returns a namespace with `ui`, `clock` and `gets` (the URLs requested so far).
+    """
+    ui._refresh_status()
+    clock = _Clock()
+    gets: list[str] = []
+
+    def _unreachable(url: str, *, timeout: object) -> tuple[int, object]:
+        gets.append(url)
+        raise requests.exceptions.ConnectionError("refused")
+
+    monkeypatch.setattr(ui, "time", clock)
+    monkeypatch.setattr(ui, "random", SimpleNamespace(uniform=lambda low, high: 1.0))
+    monkeypatch.setattr(ui, "_get_json_revalidated", _unreachable)
+    yield SimpleNamespace(ui=ui, clock=clock, gets=gets)
+    ui._refresh_status()
+
+
+def test_each_due_health_retry_sends_a_get(health_probe: SimpleNamespace):
+    ui, clock, gets = health_probe.ui, health_probe.clock, health_probe.gets
+
+    assert ui._probe_health(_REMOTE)[0] is False
+    assert len(gets) == 1
+
+    clock.now += 2.9
+    ui._probe_health(_REMOTE)
+    assert len(gets) == 1  # still inside the first 3s delay
+
+    # Due retries land well inside the real 3s _healthcheck TTL; each must still reach the network.
+    for delay in (3.0, 6.0, 12.0):
+        clock.now += delay
+        assert ui._probe_health(_REMOTE)[0] is False
+    assert gets == [f"{_REMOTE}/healthz"] * 4
+
+
+def test_sessions_arriving_during_a_due_retry_share_one_get(
+    health_probe: SimpleNamespace, monkeypatch: pytest.MonkeyPatch
+):
+    ui, clock, gets = health_probe.ui, health_probe.clock, health_probe.gets
+    first = ui._probe_health(_REMOTE)
+    clock.now += 3.0
+
+    started = threading.Event()
+    release = threading.Event()
+
+    def _slow_unreachable(url: str, *, timeout: object) -> tuple[int, object]:
+        gets.append(url)
+        started.set()
+        release.wait(5)
+        raise requests.exceptions.ConnectionError("refused")
+
+    monkeypatch.setattr(ui, "_get_json_revalidated", _slow_unreachable)
+    claimer = threading.Thread(target=ui._probe_health, args=(_REMOTE,))
+    claimer.start()
+    assert started.wait(5)
+    try:
+        # A second session during the in-flight retry sees the last failure without probing.
+        assert ui._probe_health(_REMOTE) == first
+    finally:
+        release.set()
+        claimer.join(5)
+
+    assert len(gets) == 2  # the initial probe plus exactly one retry
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import http.client
+from types import ModuleType
+from typing import Any
+
+import pytest
+import requests
+from urllib3.exceptions import ProtocolError
+
+_URL = "https://api.example.test/review"
+
+
+class _FakeSession:
+    """Answers post() with the queued outcomes in order: an exception is raised, anything else returned."""
+
+    def __init__(self, *outcomes: Any) -> None:
+        self._outcomes = list(outcomes)
+        self.posts: list[dict[str, Any]] = []
+
+    def post(self, url: str, **kwargs: Any) -> Any:
+        self.posts.append(kwargs)
+        outcome = self._outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+
+def _stale_socket_error() -> requests.exceptions.ConnectionError:
+    reason = http.client.RemoteDisconnected("Remote end closed connection without response")
+    return requests.exceptions.ConnectionError(ProtocolError("Connection aborted.", reason))
+
+
+def test_review_post_is_resent_once_after_a_stale_keepalive_socket(ui: ModuleType, monkeypatch: pytest.MonkeyPatch):
+    ok = object()
+    session = _FakeSession(_stale_socket_error(), ok)
+    monkeypatch.setattr(ui, "_http", lambda: session)
+    bodies: list[int] = []
+
+    def _body() -> dict[str, Any]:
+        bodies.append(len(bodies))
+        return {"data": b"{}"}
+
+    assert ui._post_review_request(_URL, _body, timeout=1) is ok
+    assert bodies == [0, 1]  # rebuilt for the re-send
+    assert len(session.posts) == 2
+
+
+def test_review_post_other_connection_errors_are_not_resent(ui: ModuleType, monkeypatch: pytest.MonkeyPatch):
+    session = _FakeSession(requests.exceptions.ConnectionError("refused"), object())
+    monkeypatch.setattr(ui, "_http", lambda: session)
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        ui._post_review_request(_URL, lambda: {"data": b"{}"}, timeout=1)
+    assert len(session.posts) == 1
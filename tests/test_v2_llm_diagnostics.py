@@ -5,23 +5,43 @@ import pytest
 from app.analysis.pipeline import ReviewPipeline
 
 
-class _FailingLLM:
-    async def raw_review_json(self, *, review_payload: str) -> str:  # noqa: ARG002
-        raise RuntimeError("LLM request failed: HTTP 429")
+@pytest.fixture()
+def failing_llm(request):
+    """An LLM client whose raw_review_json raises the parametrized exception."""
+    exc = request.param
 
+    class _FailingLLM:
+        async def raw_review_json(self, *, review_payload: str) -> str:  # noqa: ARG002
+            raise exc
+
+    return _FailingLLM()
 
-@pytest.mark.asyncio
-async def test_v2_pipeline_records_llm_429_as_diagnostic_not_issue():
-    pipeline = ReviewPipeline(llm_client=_FailingLLM())
 
-    r = await pipeline.review_file(filename="x.py", code="print('hi')\n", strict=False, language="python")
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "failing_llm, expected_code",
+    [
+        pytest.param(RuntimeError("LLM request failed: HTTP 429"), "llm_rate_limited", id="http-429"),
+        pytest.param(RuntimeError("LLM request failed: HTTP 502"), "llm_http_error", id="http-502"),
+        pytest.param(TimeoutError(), "llm_timeout", id="timeout"),
+        pytest.param(ValueError("LLM returned invalid JSON"), "llm_invalid_response", id="invalid-json"),
+        pytest.param(ConnectionError("connection reset by peer"), "llm_network_error", id="network"),
+    ],
+    indirect=["failing_llm"],
+)
+async def test_v2_pipeline_records_llm_failure_as_diagnostic_not_issue(failing_llm, expected_code: str):
+    pipeline = ReviewPipeline(llm_client=failing_llm)
+
+    r = await pipeline.review_file(
+        filename="x.py", code="print('hi')\n", strict=False, language="python", run_static=False
+    )
 
     # Infra failure should not be injected into issues.
     assert all("LLM request failed" not in i.description for i in r.issues)
 
     # But it should be visible as a diagnostic.
     assert r.diagnostics
-    assert any(d.code.value == "llm_rate_limited" for d in r.diagnostics)
+    assert any(d.code.value == expected_code for d in r.diagnostics)
 
     # Score should still be computed from real issues only.
     assert 0 <= r.score.score <= 100
@@ -1,14 +1,37 @@
+import codecs
+import functools
+import gzip
+import hashlib
+import html
+import http.client
+import io
+import json
 import os
+import random
+import re
+import threading
 import time
-from typing import Any, Dict, Optional, Tuple
+import urllib.parse
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 import requests
 import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ProtocolError
+from urllib3.util.retry import Retry
+
+try:  # optional: faster serialization for the raw-response views
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
 
 st.set_page_config(page_title="CRA", layout="wide")
 
 # --- Branding / Theme ---
 _LOGO_PATH = os.path.join(os.path.dirname(__file__), "assets", "logo.png")
+_LOGO_WIDTH = 72
+_THEME_CSS_PATH = os.path.join(os.path.dirname(__file__), "assets", "theme.css")
 
 # Optional: GitHub profile shown in sidebar (no auth required)
 GITHUB_USERNAME = (os.environ.get("GITHUB_USERNAME") or "").strip()
@@ -22,272 +45,103 @@ if not GITHUB_AVATAR_URL and GITHUB_USERNAME:
     GITHUB_AVATAR_URL = f"https://github.com/{GITHUB_USERNAME}.png"
 
 
-def _apply_theme(*, mode: str) -> None:
+_THEME_VARS: Dict[str, Dict[str, str]] = {
+    "light": {
+        "bg": "#F7FAFF",
+        "sidebar-bg": "#FFFFFF",
+        "text": "#0B1625",
+        "muted": "rgba(11, 22, 37, 0.72)",
+        "border": "rgba(31, 156, 255, 0.20)",
+        "input-bg": "rgba(235, 244, 255, 1.0)",
+        "input-text": "#0B1625",
+        "placeholder": "rgba(11, 22, 37, 0.45)",
+        "glass": "rgba(255, 255, 255, 0.92)",
+        "glass2": "rgba(255, 255, 255, 0.45)",
+        "glow": "rgba(31, 156, 255, 0.22)",
+        "code-bg": "rgba(235, 244, 255, 0.90)",
+    },
+    "dark": {
+        "bg": "#070F1A",
+        "sidebar-bg": "#071528",
+        "text": "#EAF3FF",
+        "muted": "rgba(234, 243, 255, 0.75)",
+        "border": "rgba(31, 156, 255, 0.18)",
+        "input-bg": "rgba(8, 22, 38, 0.85)",
+        "input-text": "#EAF3FF",
+        "placeholder": "rgba(234, 243, 255, 0.55)",
+        "glass": "rgba(7, 21, 40, 0.88)",
+        "glass2": "rgba(7, 21, 40, 0.42)",
+        "glow": "rgba(32, 208, 255, 0.16)",
+        "code-bg": "rgba(8, 22, 38, 0.78)",
+    },
+}
+
+
+@st.cache_resource
+def _theme_rules() -> str:
+    """Static theme rules, minified; read from disk once per process.
+
+    The block rides along in every full rerun's delta, so comments and layout whitespace are stripped.
+    (A <link> to a static file is not an option: Streamlit static serving sends .css as text/plain.)
+    """
+    with open(_THEME_CSS_PATH, "r", encoding="utf-8") as f:
+        css = f.read()
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    return re.sub(r"\s*([{};])\s*", r"\1", css).strip()
+
+
+@st.cache_resource
+def _logo_bytes() -> Optional[bytes]:
+    """Logo PNG sized for the header, or None when the asset is missing; built once per process.
+
+    The source asset is ~350 KB but shown at 72px, so downscale it (2x for HiDPI) once with Pillow,
+    which Streamlit already depends on. Falls back to the original bytes if resizing fails.
+    """
+    try:
+        with open(_LOGO_PATH, "rb") as f:
+            raw = f.read()
+    except OSError:
+        return None
+    try:
+        from PIL import Image
+
+        with Image.open(io.BytesIO(raw)) as im:
+            im.thumbnail((_LOGO_WIDTH * 2, _LOGO_WIDTH * 2))
+            out = io.BytesIO()
+            im.save(out, format="PNG", optimize=True)
+        return out.getvalue()
+    except Exception:
+        return raw
+
+
+_BLUR_CSS = (
+    'section[data-testid="stSidebar"] > div, .cra-card '
+    "{ backdrop-filter: blur(12px); -webkit-backdrop-filter: blur(12px); }\n"
+)
+
+
+@st.cache_resource(show_spinner=False)
+def _theme_css(mode: str, blur: bool) -> str:
+    """Full <style> block for a (mode, blur) pair; built once per process and shared across sessions.
+
+    cache_resource (not cache_data): the str is immutable, so there is no need to unpickle a fresh copy
+    per rerun. A module-level dict would not help, since Streamlit re-executes this script on each rerun.
+    """
     # Minimal CSS overrides. Streamlit theming is limited, so we style only core surfaces.
-    is_light = (mode or "dark").lower() == "light"
-    if is_light:
-        bg = "#F7FAFF"
-        sidebar_bg = "#FFFFFF"
-        text = "#0B1625"
-        muted = "rgba(11, 22, 37, 0.72)"
-        border = "rgba(31, 156, 255, 0.20)"
-        input_bg = "rgba(235, 244, 255, 1.0)"
-        input_text = "#0B1625"
-        placeholder = "rgba(11, 22, 37, 0.45)"
-
-        glass = "rgba(255, 255, 255, 0.62)"
-        glass2 = "rgba(255, 255, 255, 0.45)"
-        glow = "rgba(31, 156, 255, 0.22)"
-        code_bg = "rgba(235, 244, 255, 0.90)"
-    else:
-        bg = "#070F1A"
-        sidebar_bg = "#071528"
-        text = "#EAF3FF"
-        muted = "rgba(234, 243, 255, 0.75)"
-        border = "rgba(31, 156, 255, 0.18)"
-        input_bg = "rgba(8, 22, 38, 0.85)"
-        input_text = "#EAF3FF"
-        placeholder = "rgba(234, 243, 255, 0.55)"
-
-        glass = "rgba(7, 21, 40, 0.62)"
-        glass2 = "rgba(7, 21, 40, 0.42)"
-        glow = "rgba(32, 208, 255, 0.16)"
-        code_bg = "rgba(8, 22, 38, 0.78)"
+    # Backdrop blur is opt-in: it forces a re-raster behind each surface and is slow on low-end GPUs.
+    palette = _THEME_VARS["light" if (mode or "dark").lower() == "light" else "dark"]
+    root_vars = "".join(f"--cra-{name}: {value}; " for name, value in palette.items())
+    blur_css = _BLUR_CSS if blur else ""
+    return f"<style>:root {{ {root_vars}--cra-radius: 16px; }}\n{_theme_rules()}{blur_css}</style>"
 
-    st.markdown(
-        f"""
-        <style>
-          :root {{
-            --cra-bg: {bg};
-            --cra-text: {text};
-            --cra-muted: {muted};
-            --cra-border: {border};
-            --cra-input-bg: {input_bg};
-            --cra-input-text: {input_text};
-            --cra-placeholder: {placeholder};
-            --cra-glass: {glass};
-            --cra-glass2: {glass2};
-            --cra-glow: {glow};
-            --cra-code-bg: {code_bg};
-            --cra-radius: 16px;
-          }}
-
-          /* App background + default text */
-          .stApp {{ background: var(--cra-bg); color: var(--cra-text); }}
-          [data-testid="stAppViewContainer"] {{
-            color: var(--cra-text);
-            background:
-              radial-gradient(900px 450px at 12% 10%, rgba(31,156,255,0.18), rgba(0,0,0,0) 60%),
-              radial-gradient(700px 400px at 82% 12%, rgba(57,229,140,0.14), rgba(0,0,0,0) 62%),
-              linear-gradient(180deg, rgba(255,255,255,0.00), rgba(255,255,255,0.00));
-          }}
-
-          /* Header title next to logo */
-          .cra-title {{
-            font-size: 2.05rem;
-            font-weight: 950;
-            line-height: 1.05;
-            letter-spacing: -0.02em;
-            margin: 0.10rem 0 0 0;
-            color: var(--cra-text);
-          }}
-          @media (max-width: 900px) {{
-            .cra-title {{ font-size: 1.65rem; }}
-          }}
-
-          /* Keep Streamlit header visible (contains the sidebar reopen toggle) but minimal */
-          header[data-testid="stHeader"] {{
-            position: sticky;
-            top: 0;
-            z-index: 1000;
-            height: 2.6rem;
-            min-height: 2.6rem;
-            background: transparent !important;
-            border: 0 !important;
-            box-shadow: none !important;
-            margin: 0 !important;
-            padding: 0 !important;
-          }}
-
-          /* Hide most of Streamlit chrome, but don't remove it from layout entirely */
-          div[data-testid="stToolbar"],
-          div[data-testid="stStatusWidget"],
-          div[data-testid="stAppToolbar"] {{
-            visibility: hidden !important;
-            pointer-events: none !important;
-            height: 0 !important;
-            min-height: 0 !important;
-            background: transparent !important;
-            border: 0 !important;
-            box-shadow: none !important;
-            margin: 0 !important;
-            padding: 0 !important;
-          }}
-
-          /* Ensure the built-in sidebar toggle is visible/clickable in the header */
-          header[data-testid="stHeader"] *[aria-label="Open sidebar"],
-          header[data-testid="stHeader"] *[aria-label="Close sidebar"],
-          header[data-testid="stHeader"] button {{
-            visibility: visible !important;
-            pointer-events: auto !important;
-          }}
-
-          /* Make header buttons visible on BOTH light and dark backgrounds */
-          header[data-testid="stHeader"] button {{
-            border-radius: 10px !important;
-            background: color-mix(in srgb, var(--cra-glass) 78%, transparent) !important;
-            border: 1px solid var(--cra-border) !important;
-          }}
-
-          /* Force icon/text inside the header buttons to use theme text color */
-          header[data-testid="stHeader"] button * {{
-            color: var(--cra-text) !important;
-            fill: var(--cra-text) !important;
-          }}
-
-          header[data-testid="stHeader"] button:hover {{
-            background: color-mix(in srgb, var(--cra-glass) 90%, transparent) !important;
-            filter: brightness(1.03);
-          }}
-
-          /* Fallback for browsers without color-mix(): still ensure some contrast */
-          @supports not (background: color-mix(in srgb, white 50%, black)) {{
-            header[data-testid="stHeader"] button {{
-              background: rgba(255, 255, 255, 0.55) !important;
-            }}
-          }}
-
-          /* Readable foreground across common Streamlit text nodes (light AND dark) */
-          [data-testid="stAppViewContainer"] p,
-          [data-testid="stAppViewContainer"] li,
-          [data-testid="stAppViewContainer"] label,
-          [data-testid="stAppViewContainer"] small,
-          [data-testid="stSidebar"] p,
-          [data-testid="stSidebar"] li,
-          [data-testid="stSidebar"] label,
-          [data-testid="stSidebar"] small,
-          [data-testid="stMarkdownContainer"] p,
-          [data-testid="stMarkdownContainer"] li,
-          [data-testid="stMarkdownContainer"] span,
-          [data-testid="stMarkdownContainer"] strong,
-          [data-testid="stMarkdownContainer"] em {{
-            color: var(--cra-text) !important;
-          }}
-
-          /* Captions */
-          [data-testid="stCaptionContainer"],
-          .stCaption,
-          .stMarkdown small {{
-            color: var(--cra-muted) !important;
-          }}
-
-          /* Inputs: background + text + placeholder (BaseWeb widgets) */
-          textarea, input,
-          .stSelectbox div[data-baseweb="select"],
-          .stTextInput div[data-baseweb="input"],
-          .stTextArea div[data-baseweb="textarea"] {{
-            background-color: var(--cra-input-bg) !important;
-            color: var(--cra-input-text) !important;
-            border-radius: 12px !important;
-            border: 1px solid var(--cra-border) !important;
-            box-shadow: 0 0 0 0 rgba(0,0,0,0) !important;
-          }}
-          textarea::placeholder, input::placeholder {{
-            color: var(--cra-placeholder) !important;
-          }}
-
-          /* BaseWeb select internals: selected value + placeholder */
-          .stSelectbox div[data-baseweb="select"] [class*="SingleValue"],
-          .stSelectbox div[data-baseweb="select"] [class*="ValueContainer"],
-          .stSelectbox div[data-baseweb="select"] [class*="Input"],
-          .stSelectbox div[data-baseweb="select"] input {{
-            color: var(--cra-input-text) !important;
-          }}
-          .stSelectbox div[data-baseweb="select"] [class*="Placeholder"],
-          .stSelectbox div[data-baseweb="select"] ::placeholder {{
-            color: var(--cra-placeholder) !important;
-          }}
-
-          /* Dropdown menu surface + items */
-          div[data-baseweb="menu"] {{
-            background: var(--cra-input-bg) !important;
-            border: 1px solid var(--cra-border) !important;
-            border-radius: 12px !important;
-          }}
-          div[data-baseweb="menu"] * {{
-            color: var(--cra-input-text) !important;
-          }}
-
-          /* Code blocks */
-          pre, code {{
-            background: var(--cra-code-bg) !important;
-            border: 1px solid var(--cra-border) !important;
-            border-radius: 12px !important;
-          }}
-
-          /* Primary button + hover */
-          div.stButton > button {{
-            background: linear-gradient(90deg, #1F9CFF 0%, #20D0FF 45%, #39E58C 100%);
-            color: #04101C;
-            border: 0;
-            font-weight: 900;
-            border-radius: 14px;
-            padding: 0.55rem 1.05rem;
-            box-shadow: 0 10px 26px rgba(0,0,0,0.20);
-            transition: transform 120ms ease, filter 120ms ease, box-shadow 160ms ease;
-            will-change: transform;
-          }}
-          div.stButton > button:hover {{
-            filter: brightness(1.08) saturate(1.03);
-            transform: translateY(-2px);
-            box-shadow: 0 14px 34px rgba(0,0,0,0.28);
-          }}
-          div.stButton > button:active {{
-            transform: translateY(0px) scale(0.99);
-            filter: brightness(1.02);
-          }}
-          div.stButton > button:focus-visible {{
-            outline: 3px solid rgba(32, 208, 255, 0.55);
-            outline-offset: 2px;
-          }}
-
-          /* Sidebar surface */
-          section[data-testid="stSidebar"] {{
-            background: {sidebar_bg};
-            border-right: 1px solid var(--cra-border);
-          }}
-          section[data-testid="stSidebar"] > div {{
-            background: var(--cra-glass);
-            backdrop-filter: blur(12px);
-            -webkit-backdrop-filter: blur(12px);
-          }}
-
-          /* Sidebar + main: ensure common widget labels/values are readable */
-          [data-testid="stSidebar"] [data-testid="stWidgetLabel"] *,
-          [data-testid="stSidebar"] [data-testid="stMarkdownContainer"] *,
-          [data-testid="stSidebar"] .stRadio *,
-          [data-testid="stSidebar"] .stSelectbox *,
-          [data-testid="stSidebar"] .stTextInput *,
-          [data-testid="stSidebar"] .stTextArea *,
-          [data-testid="stSidebar"] .stToggle *,
-          [data-testid="stSidebar"] .stButton * {{
-            color: var(--cra-text) !important;
-          }}
-
-          /* Sidebar BaseWeb menu items (radio/select options) */
-          [data-testid="stSidebar"] div[data-baseweb="menu"] * {{
-            color: var(--cra-input-text) !important;
-          }}
-
-          /* Metrics in sidebar */
-          [data-testid="stSidebar"] [data-testid="stMetricValue"],
-          [data-testid="stSidebar"] [data-testid="stMetricLabel"] {{
-            color: var(--cra-text) !important;
-          }}
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
+
+def _apply_theme(*, mode: str, blur: bool) -> None:
+    # Must be emitted on every full rerun: Streamlit drops any element a rerun does not re-emit,
+    # so a "already injected" sentinel would strip the theme after the first interaction.
+    # Filter interactions never get here (they rerun only the results fragment), and the
+    # string itself is cached, so what remains per rerun is a single delta.
+    st.markdown(_theme_css(mode, blur), unsafe_allow_html=True)
 
 
 _DEFAULT_API_CANDIDATES = [
@@ -301,113 +155,297 @@ if API_BASE_URL is None or not API_BASE_URL.strip():
 API_BASE_URL = API_BASE_URL.rstrip("/")
 
 
+# (connect, read): fail fast when the backend is unreachable, but give a running review
+# (linters + LLM) the full minute to answer.
+_REVIEW_TIMEOUT = (3.05, 60)
+
+
+def _pooled_session(max_retries: Union[int, Retry]) -> requests.Session:
+    session = requests.Session()
+    # Only a handful of hosts are ever contacted (the API plus Firebase identitytoolkit).
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=max_retries)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@st.cache_resource
+def _http() -> requests.Session:
+    """Process-wide pooled session so reviews reuse TCP/TLS connections."""
+    # Retry connect errors only: the request never went out, so re-sending a POST is safe. Read
+    # errors are not retried here; _post_review_request covers a pooled socket the server closed.
+    return _pooled_session(Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.1))
+
+
+@st.cache_resource
+def _status_http() -> requests.Session:
+    """Pooled session for /healthz and /configz; no retries, so an unreachable API fails fast."""
+    return _pooled_session(0)
+
+
+def _is_stale_keepalive(exc: requests.exceptions.ConnectionError) -> bool:
+    # A reused socket the server already closed surfaces as ProtocolError(..., RemoteDisconnected).
+    err = exc.args[0] if exc.args else None
+    return isinstance(err, ProtocolError) and any(isinstance(a, http.client.RemoteDisconnected) for a in err.args)
+
+
+def _post_review_request(url: str, body: Callable[[], Dict[str, Any]], **kwargs: Any) -> requests.Response:
+    """POST a review request, re-sending once when a pooled keep-alive socket turns out to be closed.
+
+    `body` returns the data/files/headers kwargs and is called once per attempt, so file bodies can rewind.
+    """
+    try:
+        return _http().post(url, **body(), **kwargs)
+    except requests.exceptions.ConnectionError as e:
+        if not _is_stale_keepalive(e):
+            raise
+    return _http().post(url, **body(), **kwargs)
+
+
+def _json_body(resp: requests.Response) -> Any:
+    """Decode a JSON response body; orjson parses the raw bytes directly when installed.
+
+    Raises ValueError on malformed JSON (orjson.JSONDecodeError subclasses it), like resp.json().
+    """
+    if orjson is not None:
+        return orjson.loads(resp.content)
+    return resp.json()
+
+
 def _is_default_local_api(url: str) -> bool:
     u = (url or "").strip().lower().rstrip("/")
     return u in {"http://127.0.0.1:8000", "http://localhost:8000"}
 
 
-def _healthcheck(base_url: str) -> Tuple[bool, str, Optional[Dict[str, Any]]]:
+@st.cache_resource
+def _etag_cache() -> Dict[str, Tuple[str, Any]]:
+    """url -> (ETag, parsed body) of the last 200 from a status endpoint (process-wide)."""
+    return {}
+
+
+def _get_json_revalidated(url: str, *, timeout: Union[float, Tuple[float, float]]) -> Tuple[int, Any]:
+    """GET a JSON status endpoint with If-None-Match; a 304 reuses the body parsed for that ETag.
+
+    Returns (status, payload) with 304 reported as 200; payload is None for a non-JSON body.
+    """
+    cache = _etag_cache()
+    cached = cache.get(url)
+    resp = _status_http().get(url, headers={"If-None-Match": cached[0]} if cached else None, timeout=timeout)
+    if resp.status_code == 304 and cached is not None:
+        return 200, cached[1]
+    if resp.status_code != 200:
+        return resp.status_code, None
     try:
-        resp = requests.get(f"{base_url}/healthz", timeout=2)
-        if resp.status_code != 200:
-            return False, f"HTTP {resp.status_code}", None
-        try:
-            payload = resp.json()
-        except ValueError:
-            payload = None
-        return True, "Healthy", payload
+        payload = _json_body(resp)
+    except ValueError:
+        return 200, None
+    if etag := resp.headers.get("ETag"):
+        cache[url] = (etag, payload)
+    return 200, payload
+
+
+HealthResult = Tuple[bool, str, Optional[Dict[str, Any]]]
+
+
+def _is_http_url(url: str) -> bool:
+    parsed = urllib.parse.urlsplit(url)
+    return parsed.scheme in ("http", "https") and bool(parsed.netloc)
+
+
+def _status_timeout(base_url: str) -> Union[float, Tuple[float, float]]:
+    # A loopback connect either succeeds at once or is refused; 1s covers a busy machine.
+    return (1.0, 2) if _is_default_local_api(base_url) else 2
+
+
+def _fetch_health(base_url: str) -> HealthResult:
+    # A mistyped CODE_REVIEW_API_URL fails here instead of after DNS and connect timeouts.
+    if not _is_http_url(base_url):
+        return False, "Invalid API URL (expected http(s)://host[:port])", None
+    try:
+        status, payload = _get_json_revalidated(f"{base_url}/healthz", timeout=_status_timeout(base_url))
     except requests.exceptions.RequestException as e:
         return False, f"Not reachable: {e.__class__.__name__}", None
+    if status != 200:
+        return False, f"HTTP {status}", None
+    return True, "Healthy", payload
+
+
+@st.cache_data(ttl=3, show_spinner=False)
+def _healthcheck(base_url: str) -> HealthResult:
+    return _fetch_health(base_url)
 
 
+@st.cache_data(ttl=30, show_spinner=False)
 def _get_configz(base_url: str) -> Optional[Dict[str, Any]]:
+    if not _is_http_url(base_url):
+        return None
     try:
-        resp = requests.get(f"{base_url}/configz", timeout=2)
-        if resp.status_code != 200:
-            return None
-        return resp.json()
+        status, payload = _get_json_revalidated(f"{base_url}/configz", timeout=_status_timeout(base_url))
     except requests.exceptions.RequestException:
         return None
+    return payload if status == 200 else None
+
+
+_HEALTH_BACKOFF_BASE = 3.0
+_HEALTH_BACKOFF_MAX = 30.0
+
+
+@dataclass
+class _HealthBackoff:
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    # base_url -> (retry_at, delay after the next failure, last failed result)
+    failures: Dict[str, Tuple[float, float, HealthResult]] = field(default_factory=dict)
+
+
+@st.cache_resource
+def _health_backoff() -> _HealthBackoff:
+    """Process-wide failure state, so every open tab shares one retry schedule per API."""
+    return _HealthBackoff()
+
+
+def _probe_health(base_url: str) -> HealthResult:
+    """Health for this run; while a remote API keeps failing, re-probe with capped exponential backoff.
+
+    A failure is reused (by all sessions) until its retry time; each failed probe doubles the delay
+    up to 30s, with +-20% jitter so separate UI processes don't retry in lockstep. Success resets it.
+    The default local API is probed on every run: a refused loopback connect costs nothing, and a
+    cached "Not reachable" would hide a freshly started server.
+    """
+    if _is_default_local_api(base_url):
+        return _fetch_health(base_url)
+
+    state = _health_backoff()
+    now = time.monotonic()
+    with state.lock:
+        entry = state.failures.get(base_url)
+        if entry is not None:
+            if now < entry[0]:
+                return entry[2]
+            # Claim this retry: sessions arriving during the probe keep showing the last failure.
+            state.failures[base_url] = (now + entry[1], entry[1], entry[2])
+
+    # A due retry must reach the network: the 3s _healthcheck entry may still hold the failure
+    # being retried. The backoff above already bounds how often this runs.
+    result = _fetch_health(base_url) if entry is not None else _healthcheck(base_url)
+    with state.lock:
+        if result[0]:
+            state.failures.pop(base_url, None)
+            if entry is not None:
+                # Drop the cached failure so the next run doesn't start a new backoff from it.
+                _healthcheck.clear()
+        else:
+            delay = entry[1] if entry is not None else _HEALTH_BACKOFF_BASE
+            retry_at = now + delay * random.uniform(0.8, 1.2)
+            state.failures[base_url] = (retry_at, min(delay * 2, _HEALTH_BACKOFF_MAX), result)
+    return result
+
+
+def _refresh_status() -> None:
+    _healthcheck.clear()
+    _get_configz.clear()
+    state = _health_backoff()
+    with state.lock:
+        state.failures.clear()
+
+
+_FB_ACCOUNTS = "https://identitytoolkit.googleapis.com/v1/accounts"
+_FB_SIGNUP = f"{_FB_ACCOUNTS}:signUp"
+_FB_SIGNIN = f"{_FB_ACCOUNTS}:signInWithPassword"
+_FB_CREATE_AUTH_URI = f"{_FB_ACCOUNTS}:createAuthUri"
+
+_FIREBASE_CONFIGURATION_NOT_FOUND_HELP = (
+    "Firebase error: CONFIGURATION_NOT_FOUND\n\n"
+    "This means the Web API key is valid, but the Firebase Authentication configuration for this project isn't available.\n"
+    "Fix (in the SAME Firebase project as this Web API key):\n"
+    "1) Firebase Console → Authentication → Get started\n"
+    "2) Authentication → Sign-in method → enable Email/Password\n\n"
+    "If you enabled it already, double-check you're in the right project (top-left project picker) and try again after 1-2 minutes.\n\n"
+)
 
 
 def _firebase_error_from_response(resp: requests.Response) -> str:
+    # Decode the body bytes once: parse them, or show them as-is when they are not JSON.
     try:
-        payload = resp.json()
+        payload = _json_body(resp)
     except ValueError:
-        return "Firebase error: HTTP %s: %s" % (resp.status_code, resp.text)
+        return f"Firebase error: HTTP {resp.status_code}: {resp.content.decode('utf-8', 'replace')}"
 
-    err = payload.get("error") if isinstance(payload, dict) else None
-    msg = None
-    if isinstance(err, dict):
-        msg = err.get("message")
-
-    if msg == "CONFIGURATION_NOT_FOUND":
-        return (
-            "Firebase error: CONFIGURATION_NOT_FOUND\n\n"
-            "This means the Web API key is valid, but the Firebase Authentication configuration for this project isn't available.\n"
-            "Fix (in the SAME Firebase project as this Web API key):\n"
-            "1) Firebase Console → Authentication → Get started\n"
-            "2) Authentication → Sign-in method → enable Email/Password\n\n"
-            "If you enabled it already, double-check you're in the right project (top-left project picker) and try again after 1-2 minutes.\n\n"
-            "Raw: %s" % payload
-        )
-
-    if isinstance(err, dict) and msg:
+    if isinstance(payload, dict) and isinstance(err := payload.get("error"), dict) and (msg := err.get("message")):
+        if msg == "CONFIGURATION_NOT_FOUND":
+            return f"{_FIREBASE_CONFIGURATION_NOT_FOUND_HELP}Raw: {payload}"
         # Include the raw payload to make API_KEY_INVALID obvious.
-        return "Firebase error: %s\n\nRaw: %s" % (msg, payload)
+        return f"Firebase error: {msg}\n\nRaw: {payload}"
+
+    return f"Firebase error: HTTP {resp.status_code}: {payload}"
+
+
+@st.cache_data(ttl=600, max_entries=4, show_spinner=False)
+def _firebase_preflight_cached(api_key: str) -> Tuple[bool, str]:
+    # Transport errors propagate: st.cache_data does not cache exceptions, so only an answer from
+    # Identity Toolkit is remembered and a timeout is retried on the next call.
+    resp = _http().post(
+        _FB_CREATE_AUTH_URI,
+        params={"key": api_key},
+        json={"identifier": "test@example.com", "continueUri": "http://localhost"},
+        timeout=10,
+    )
+    if resp.status_code == 200:
+        return True, "Firebase API key looks valid (Identity Toolkit reachable)"
 
-    return "Firebase error: HTTP %s: %s" % (resp.status_code, payload)
+    return False, _firebase_error_from_response(resp)
 
 
 def _firebase_preflight(*, api_key: str) -> Tuple[bool, str]:
     """Validate the API key is recognized by Identity Toolkit.
 
     This helps diagnose CONFIGURATION_NOT_FOUND vs API_KEY_INVALID.
+    Answers are cached per key for 10 minutes (st.cache_data, not lru_cache: this script is
+    re-executed on every rerun, which would recreate an lru_cache); network failures are not cached.
     """
     api_key = (api_key or "").strip()
     if not api_key:
         return False, "FIREBASE_WEB_API_KEY is empty"
 
-    url = "https://identitytoolkit.googleapis.com/v1/accounts:createAuthUri?key=%s" % api_key
     try:
-        resp = requests.post(
-            url, json={"identifier": "test@example.com", "continueUri": "http://localhost"}, timeout=10
-        )
+        return _firebase_preflight_cached(api_key)
     except requests.exceptions.RequestException as e:
-        return False, "Preflight failed: %s" % e.__class__.__name__
-
-    if resp.status_code == 200:
-        return True, "Firebase API key looks valid (Identity Toolkit reachable)"
-
-    return False, _firebase_error_from_response(resp)
+        return False, f"Preflight failed: {e.__class__.__name__}"
 
 
 def _firebase_signup_email_password(*, api_key: str, email: str, password: str) -> Tuple[Optional[dict], Optional[str]]:
-    url = "https://identitytoolkit.googleapis.com/v1/accounts:signUp?key=%s" % api_key
     try:
-        resp = requests.post(url, json={"email": email, "password": password, "returnSecureToken": True}, timeout=15)
+        resp = _http().post(
+            _FB_SIGNUP,
+            params={"key": api_key},
+            json={"email": email, "password": password, "returnSecureToken": True},
+            timeout=15,
+        )
     except requests.exceptions.RequestException as e:
-        return None, "Firebase request failed: %r" % (e,)
+        return None, f"Firebase request failed: {e!r}"
     if resp.status_code != 200:
         return None, _firebase_error_from_response(resp)
     try:
-        return resp.json(), None
+        return _json_body(resp), None
     except ValueError as e:
-        return None, "Firebase invalid JSON: %s" % e
+        return None, f"Firebase invalid JSON: {e}"
 
 
 def _firebase_signin_email_password(*, api_key: str, email: str, password: str) -> Tuple[Optional[dict], Optional[str]]:
-    url = "https://identitytoolkit.googleapis.com/v1/accounts:signInWithPassword?key=%s" % api_key
     try:
-        resp = requests.post(url, json={"email": email, "password": password, "returnSecureToken": True}, timeout=15)
+        resp = _http().post(
+            _FB_SIGNIN,
+            params={"key": api_key},
+            json={"email": email, "password": password, "returnSecureToken": True},
+            timeout=15,
+        )
     except requests.exceptions.RequestException as e:
-        return None, "Firebase request failed: %r" % (e,)
+        return None, f"Firebase request failed: {e!r}"
     if resp.status_code != 200:
         return None, _firebase_error_from_response(resp)
     try:
-        return resp.json(), None
+        return _json_body(resp), None
     except ValueError as e:
-        return None, "Firebase invalid JSON: %s" % e
+        return None, f"Firebase invalid JSON: {e}"
 
 
 def _auth_headers() -> Dict[str, str]:
@@ -429,22 +467,52 @@ def _get_rate(base_url: str) -> Optional[Dict[str, Any]]:
     return None
 
 
+_GZIP_MIN_BYTES = 4096
+_V2_RETRY_AFTER_SECONDS = 600.0
+
+
+@st.cache_resource
+def _v2_unavailable() -> Dict[str, float]:
+    """base_url -> monotonic time the API answered 404/405 for /v2/review/file (process-wide)."""
+    return {}
+
+
+def _review_body_kwargs(base_url: str, body: Dict[str, Any]) -> Dict[str, Any]:
+    """requests.post kwargs for a JSON review body; large bodies (pasted sources) go gzip-compressed.
+
+    The API inflates `Content-Encoding: gzip` bodies before routing (app/request_decompression.py)
+    and lists "gzip" in /configz `request_encodings`; older APIs without it get plain JSON.
+    """
+    raw = orjson.dumps(body) if orjson is not None else json.dumps(body).encode("utf-8")
+    headers = {**_auth_headers(), "Content-Type": "application/json"}
+    if len(raw) >= _GZIP_MIN_BYTES and "gzip" in ((_get_configz(base_url) or {}).get("request_encodings") or ()):
+        # Level 1: source text still shrinks several-fold, at a fraction of level 9's CPU cost.
+        raw = gzip.compress(raw, compresslevel=1)
+        headers["Content-Encoding"] = "gzip"
+    return {"data": raw, "headers": headers}
+
+
 def _post_review(
     base_url: str, *, code: str, language: str = "python", filename: Optional[str] = None, strict: bool = False
 ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
     # Prefer v2 structured pipeline for Python, since it includes custom logical rules + scoring.
-    if (language or "python").lower().strip() == "python":
+    # Skip v2 for a while once an API has shown it does not have the route, so v1-only deployments
+    # are not charged a failing POST per review. Transient errors (timeouts, 5xx) do not count.
+    v2_missing_since = _v2_unavailable().get(base_url)
+    v2_known_missing = v2_missing_since is not None and time.monotonic() - v2_missing_since < _V2_RETRY_AFTER_SECONDS
+    if (language or "python").lower().strip() == "python" and not v2_known_missing:
         v2_body: Dict[str, Any] = {"filename": filename or "input.py", "code": code}
         try:
-            resp = requests.post(
+            resp = _post_review_request(
                 f"{base_url}/v2/review/file",
-                json=v2_body,
-                headers=_auth_headers(),
-                timeout=60,
+                functools.partial(_review_body_kwargs, base_url, v2_body),
+                timeout=_REVIEW_TIMEOUT,
                 params={"strict": bool(strict)},
             )
+            if resp.status_code in (404, 405):
+                _v2_unavailable()[base_url] = time.monotonic()
             if resp.status_code == 200:
-                payload = resp.json()
+                payload = _json_body(resp)
                 # Adapt v2 response into the v1 UI shape expected elsewhere in this file.
                 issues = payload.get("issues") or []
                 return {
@@ -467,29 +535,63 @@ def _post_review(
     if filename:
         body["filename"] = filename
     try:
-        resp = requests.post(f"{base_url}/review", json=body, headers=_auth_headers(), timeout=60)
+        resp = _post_review_request(
+            f"{base_url}/review", functools.partial(_review_body_kwargs, base_url, body), timeout=_REVIEW_TIMEOUT
+        )
     except requests.exceptions.RequestException as e:
         return None, f"Request failed: {e!r}"
     if resp.status_code != 200:
         return None, f"HTTP {resp.status_code}: {resp.text}"
     try:
-        return resp.json(), None
+        return _json_body(resp), None
     except ValueError as e:
         return None, f"Invalid JSON from server: {e}"
 
 
+_STREAM_UPLOAD_MIN_BYTES = 64 * 1024
+
+
+@st.cache_resource
+def _multipart_encoder() -> Optional[type]:
+    """requests_toolbelt's MultipartEncoder (optional), or None when it is not installed.
+
+    Imported here rather than at the top: only large uploads need it, and a failed import is not
+    cached in sys.modules, so a top-level attempt would search sys.path again on every rerun.
+    """
+    try:
+        from requests_toolbelt import MultipartEncoder
+    except ImportError:
+        return None
+    return MultipartEncoder
+
+
 def _post_review_file(
-    base_url: str, *, filename: str, content: bytes
+    base_url: str, *, filename: str, fileobj: BinaryIO
 ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
-    files = {"file": (filename, content, "text/x-python")}
+    # requests reads the handle straight into the multipart body; no separate getvalue() copy.
+    # Large files are streamed in chunks when requests_toolbelt is available, so that body is
+    # never materialized either.
+    size = fileobj.seek(0, io.SEEK_END)
+    file_part = (filename, fileobj, "text/x-python")
+    headers = _auth_headers()
+    encoder_cls = _multipart_encoder() if size >= _STREAM_UPLOAD_MIN_BYTES else None
+
+    def _body() -> Dict[str, Any]:
+        # Rebuilt per attempt: a re-send must start from the first byte again.
+        fileobj.seek(0)
+        if encoder_cls is not None:
+            encoder = encoder_cls(fields={"file": file_part})
+            return {"data": encoder, "headers": {**headers, "Content-Type": encoder.content_type}}
+        return {"files": {"file": file_part}, "headers": headers}
+
     try:
-        resp = requests.post(f"{base_url}/review/file", files=files, headers=_auth_headers(), timeout=60)
+        resp = _post_review_request(f"{base_url}/review/file", _body, timeout=_REVIEW_TIMEOUT)
     except requests.exceptions.RequestException as e:
         return None, f"Request failed: {e!r}"
     if resp.status_code != 200:
         return None, f"HTTP {resp.status_code}: {resp.text}"
     try:
-        return resp.json(), None
+        return _json_body(resp), None
     except ValueError as e:
         return None, f"Invalid JSON from server: {e}"
 
@@ -499,144 +601,328 @@ def _post_review_github(
 ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
     body: Dict[str, Any] = {"repo_url": repo_url, "path": path, "ref": ref, "strict": bool(strict)}
     try:
-        resp = requests.post(f"{base_url}/review/github", json=body, headers=_auth_headers(), timeout=60)
+        resp = _post_review_request(
+            f"{base_url}/review/github", functools.partial(_review_body_kwargs, base_url, body), timeout=_REVIEW_TIMEOUT
+        )
     except requests.exceptions.RequestException as e:
         return None, f"Request failed: {e!r}"
     if resp.status_code != 200:
         return None, f"HTTP {resp.status_code}: {resp.text}"
     try:
-        return resp.json(), None
+        return _json_body(resp), None
     except ValueError as e:
         return None, f"Invalid JSON from server: {e}"
 
 
-def _render_review_response(data: Dict[str, Any]) -> None:
-    issues = (data or {}).get("issues", [])
+def _split_paths(text: str) -> List[str]:
+    """Repo paths from a comma/newline-separated field, blanks and repeats dropped, order kept."""
+    return list(dict.fromkeys(p.strip() for p in re.split(r"[,\n]", text or "") if p.strip()))
 
-    static = (data or {}).get("static_analysis") or {}
-    flake8 = (static.get("flake8") or {}) if isinstance(static, dict) else {}
-    bandit = (static.get("bandit") or {}) if isinstance(static, dict) else {}
 
-    flake8_issues = (flake8.get("issues") or []) if isinstance(flake8, dict) else []
-    bandit_results = []
-    if isinstance(bandit, dict):
-        bandit_results = (
-            ((bandit.get("result") or {}).get("results") or []) if isinstance(bandit.get("result"), dict) else []
+def _post_review_github_batch(
+    base_url: str, *, repo_url: str, paths: List[str], ref: str, strict: bool
+) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    # One request for all paths: the API fetches and reviews them concurrently.
+    body: Dict[str, Any] = {"repo_url": repo_url, "paths": paths, "ref": ref, "strict": bool(strict)}
+    try:
+        resp = _post_review_request(
+            f"{base_url}/review/github/batch",
+            functools.partial(_review_body_kwargs, base_url, body),
+            timeout=_REVIEW_TIMEOUT,
         )
+    except requests.exceptions.RequestException as e:
+        return None, f"Request failed: {e!r}"
+    if resp.status_code != 200:
+        return None, f"HTTP {resp.status_code}: {resp.text}"
+    try:
+        return _json_body(resp), None
+    except ValueError as e:
+        return None, f"Invalid JSON from server: {e}"
+
+
+def _card_header(title: str, body_html: str = "") -> None:
+    # One self-contained element per sidebar card. Each st.markdown call is its own element, so a
+    # '<div class="cra-card">' opened in one call never wrapped the widgets below it anyway; the
+    # separate opener/closer calls only cost extra deltas. Static markup that directly follows the
+    # title (body_html: trusted or already escaped) rides along in the same element.
+    st.markdown(
+        f'<div class="cra-card"><div class="cra-card-title">{html.escape(title)}</div></div>{body_html}',
+        unsafe_allow_html=True,
+    )
+
+
+@dataclass(slots=True, frozen=True)
+class StaticSummary:
+    flake8_issues: List[Dict[str, Any]]
+    bandit_results: List[Dict[str, Any]]
+    tool_failed: bool
+
+
+def _summarize_static(data: Dict[str, Any]) -> StaticSummary:
+    """Pull flake8/bandit findings out of a review response in one guarded pass."""
+    static = (data or {}).get("static_analysis")
+    if not isinstance(static, dict):
+        return StaticSummary(flake8_issues=[], bandit_results=[], tool_failed=False)
+
+    flake8 = static.get("flake8")
+    bandit = static.get("bandit")
+    flake8 = flake8 if isinstance(flake8, dict) else {}
+    bandit = bandit if isinstance(bandit, dict) else {}
+
+    result = bandit.get("result")
+    bandit_results = (result.get("results") or []) if isinstance(result, dict) else []
+    tool_failed = bool(flake8.get("tool_error")) or (bandit.get("exit_code") not in (None, 0) and not result)
+    return StaticSummary(
+        flake8_issues=flake8.get("issues") or [],
+        bandit_results=bandit_results,
+        tool_failed=tool_failed,
+    )
+
+
+def _pretty_json(data: Any) -> str:
+    """Indented JSON for display; st.code renders it as plain text instead of st.json's widget tree."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str).decode("utf-8")
+    return json.dumps(data, indent=2, ensure_ascii=False, default=str)
 
-    static_tool_failed = False
-    if isinstance(flake8, dict) and flake8.get("tool_error"):
-        static_tool_failed = True
-    if isinstance(bandit, dict) and bandit.get("exit_code") not in (None, 0) and not bandit.get("result"):
-        static_tool_failed = True
 
-    static_findings_present = bool(flake8_issues) or bool(bandit_results)
+def _flake8_lines(flake8_issues: List[Dict[str, Any]]) -> Iterator[str]:
+    for j, it in enumerate(flake8_issues, 1):
+        loc = f"{it.get('path', 'input.py')}:{it.get('row', '?')}:{it.get('col', '?')}"
+        yield f"**{j}. {it.get('code', '')}** — {it.get('message', '')}  \n`{loc}`"
 
-    clean = (not issues) and (not static_findings_present) and (not static_tool_failed)
 
-    if clean:
+def _bandit_lines(bandit_results: List[Dict[str, Any]]) -> Iterator[str]:
+    for j, it in enumerate(bandit_results, 1):
+        test_id = it.get("test_id") or it.get("test_name") or "bandit"
+        sev_b = it.get("issue_severity") or "unknown"
+        conf = it.get("issue_confidence") or "unknown"
+        text = it.get("issue_text") or it.get("issue") or ""
+        fname = it.get("filename") or ""
+        line = it.get("line_number") or it.get("line") or ""
+        where = f"{fname}:{line}" if fname or line else ""
+
+        entry = f"**{j}. {test_id}** — severity={sev_b}, confidence={conf}"
+        if text:
+            entry += f"  \n{text}"
+        if where:
+            entry += f"  \n`{where}`"
+        yield entry
+
+
+def _metrics_html(metrics: List[Tuple[str, int]]) -> str:
+    """Count tiles as one grid block: a single element instead of st.columns plus one st.metric each."""
+    cells = "".join(
+        f'<div class="cra-metric"><div class="cra-metric-label">{html.escape(label)}</div>'
+        f'<div class="cra-metric-value">{value}</div></div>'
+        for label, value in metrics
+    )
+    return f'<div class="cra-metrics">{cells}</div>'
+
+
+def _issue_title(issue: Dict[str, Any]) -> str:
+    return f"{str(issue.get('severity', 'unknown')).upper()} · {issue.get('category', 'unknown')} · {issue.get('location') or 'location n/a'}"
+
+
+def _issue_details_html(i: int, issue: Dict[str, Any]) -> str:
+    # LLM output is untrusted: every interpolated field is escaped before it reaches unsafe_allow_html.
+    esc = html.escape
+    return (
+        f"<details><summary>Issue {i}: {esc(_issue_title(issue))}</summary>"
+        f"<p><strong>Problem:</strong> {esc(str(issue.get('description') or ''))}</p>"
+        f"<p><strong>Suggestion:</strong> {esc(str(issue.get('suggestion') or ''))}</p>"
+        "</details>"
+    )
+
+
+@dataclass(slots=True, frozen=True)
+class ReviewView:
+    """A review response plus its filter-independent formatted output, built once per response."""
+
+    data: Dict[str, Any]
+    static: StaticSummary
+    flake8_md: str
+    bandit_md: str
+    raw_json: str
+    issues: List[Dict[str, Any]]
+    issue_blobs: List[str]  # casefolded search text, parallel to `issues`
+    sev_options: List[str]
+    cat_options: List[str]
+    clean: bool  # no LLM issues, no static findings, and every static tool ran
+
+
+def _format_review(data: Dict[str, Any], *, raw_json: Optional[str] = None) -> ReviewView:
+    static = _summarize_static(data)
+    issues = [it for it in data.get("issues") or [] if isinstance(it, dict)]
+    return ReviewView(
+        data=data,
+        static=static,
+        flake8_md="\n\n".join(_flake8_lines(static.flake8_issues)),
+        bandit_md="\n\n".join(_bandit_lines(static.bandit_results)),
+        raw_json=raw_json if raw_json is not None else _pretty_json(data),
+        issues=issues,
+        issue_blobs=[
+            " ".join(str(it.get(k) or "") for k in ("description", "suggestion", "location", "category")).casefold()
+            for it in issues
+        ],
+        sev_options=sorted({sev for it in issues if (sev := it.get("severity"))}),
+        cat_options=sorted({cat for it in issues if (cat := it.get("category"))}),
+        clean=not (data.get("issues") or static.flake8_issues or static.bandit_results or static.tool_failed),
+    )
+
+
+_REVIEW_CACHE_MAX = 16
+_UPLOAD_MAX_BYTES = 2 * 1024 * 1024
+_UTF8_PROBE_BYTES = 4096
+
+
+def _utf8_prefix_ok(data: memoryview) -> bool:
+    """True when the first 4 KiB decode as UTF-8; a character cut at the boundary is fine.
+
+    The API rejects non-UTF-8 uploads, so a binary file renamed to .py is caught before sending it.
+    """
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(data[:_UTF8_PROBE_BYTES], final=False)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def _submission_key(*parts: Any) -> str:
+    """Content digest of a review submission (inputs + options + target API)."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        if isinstance(part, memoryview):
+            h.update(part)
+        else:
+            h.update(str(part).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _remember_review(cache: Dict[str, Dict[str, Any]], key: str, data: Optional[Dict[str, Any]]) -> None:
+    """Store a successful response under its submission key (most recent last, oldest evicted).
+
+    Also called on cache hits, which moves the entry to the end of the LRU order.
+    """
+    if data is None:
+        return
+    cache.pop(key, None)
+    cache[key] = data
+    while len(cache) > _REVIEW_CACHE_MAX:
+        cache.pop(next(iter(cache)))
+
+
+# Fragment: the issue filters rerun only this block (not theme/health/sidebar), and the
+# rendered review survives those reruns even though the "Review" button is no longer pressed.
+@st.fragment
+def _render_review_response(view: ReviewView, *, key: str = "review") -> None:
+    # Fragment reruns receive the same view, so only the filter-dependent issue list is rebuilt.
+    # `key` namespaces the filter widgets when several reviews are rendered on one page.
+    # Keep the clean check first: nothing (tabs, columns, warnings) may be emitted before it.
+    if view.clean:
         st.success("No issues found. Code looks good ✅")
         return
 
+    data = view.data
+    issues = data.get("issues", [])
+
+    summary = view.static
+    flake8_issues = summary.flake8_issues
+    bandit_results = summary.bandit_results
+    static_tool_failed = summary.tool_failed
+
     if static_tool_failed:
         st.warning(
             "LLM review returned no issues, but one or more static analysis tools failed to run. Open 'Raw JSON' for details."
         )
 
-    # Tabs
-    tabs = st.tabs(["Summary", "LLM Issues", "flake8", "bandit", "Strict", "Raw JSON"])
-    with tabs[0]:
-        col1, col2, col3 = st.columns(3)
-        col1.metric("LLM issues", len(issues))
-        col2.metric("flake8 findings", len(flake8_issues))
-        col3.metric("bandit findings", len(bandit_results))
+    strict_text = data.get("strict_findings")
+
+    # Tabs: only those with something to show (Summary and Raw JSON are always present).
+    labels = ["Summary"]
+    if issues:
+        labels.append("LLM Issues")
+    if flake8_issues:
+        labels.append("flake8")
+    if bandit_results:
+        labels.append("bandit")
+    if strict_text:
+        labels.append("Strict")
+    labels.append("Raw JSON")
+    tabs = dict(zip(labels, st.tabs(labels)))
+
+    with tabs["Summary"]:
+        st.markdown(
+            _metrics_html(
+                [
+                    ("LLM issues", len(issues)),
+                    ("flake8 findings", len(flake8_issues)),
+                    ("bandit findings", len(bandit_results)),
+                ]
+            ),
+            unsafe_allow_html=True,
+        )
 
-        rl = (data or {}).get("rate_limit")
+        rl = data.get("rate_limit")
         if isinstance(rl, dict):
             st.caption(
                 f"Rate limit: {rl.get('remaining')}/{rl.get('limit')} remaining (reset in {rl.get('reset_seconds')}s)"
             )
 
-    with tabs[1]:
-        if not issues:
-            st.info("No LLM issues.")
-        else:
-            sev_options = sorted(
-                {(it or {}).get("severity") for it in issues if isinstance(it, dict) and (it or {}).get("severity")}
-            )
-            cat_options = sorted(
-                {(it or {}).get("category") for it in issues if isinstance(it, dict) and (it or {}).get("category")}
-            )
+    if "LLM Issues" in tabs:
+        with tabs["LLM Issues"]:
+            sev_options, cat_options = view.sev_options, view.cat_options
             fcol1, fcol2, fcol3 = st.columns([2, 2, 3])
             with fcol1:
-                sev = st.multiselect("Severity", sev_options, default=sev_options)
+                sev = st.multiselect("Severity", sev_options, default=sev_options, key=f"{key}_sev")
             with fcol2:
-                cat = st.multiselect("Category", cat_options, default=cat_options)
+                cat = st.multiselect("Category", cat_options, default=cat_options, key=f"{key}_cat")
             with fcol3:
-                q = st.text_input("Search", value="")
-
-            def _match(it: Dict[str, Any]) -> bool:
-                if sev and it.get("severity") not in sev:
-                    return False
-                if cat and it.get("category") not in cat:
-                    return False
-                if q.strip():
-                    qq = q.strip().lower()
-                    blob = (
-                        "%s %s %s %s"
-                        % (it.get("description"), it.get("suggestion"), it.get("location"), it.get("category"))
-                    ).lower()
-                    return qq in blob
-                return True
-
-            filtered = [it for it in issues if isinstance(it, dict) and _match(it)]
+                q = st.text_input("Search", value="", key=f"{key}_q")
+
+            sev_set, cat_set = set(sev), set(cat)
+            qq = q.strip().casefold()
+            filtered = [
+                it
+                for it, blob in zip(view.issues, view.issue_blobs)
+                if (not sev_set or it.get("severity") in sev_set)
+                and (not cat_set or it.get("category") in cat_set)
+                and (not qq or qq in blob)
+            ]
             st.caption(f"Showing {len(filtered)}/{len(issues)}")
+            # One markdown call for the whole run of plain issues; only issues carrying metadata
+            # (rare) need a real expander for st.json. Order is preserved by flushing at each one.
+            pending: List[str] = []
             for i, issue in enumerate(filtered, 1):
-                title = f"{issue.get('severity', 'unknown').upper()} · {issue.get('category', 'unknown')} · {issue.get('location') or 'location n/a'}"
-                with st.expander(f"Issue {i}: {title}"):
+                if not issue.get("metadata"):
+                    pending.append(_issue_details_html(i, issue))
+                    continue
+                if pending:
+                    st.markdown("".join(pending), unsafe_allow_html=True)
+                    pending = []
+                with st.expander(f"Issue {i}: {_issue_title(issue)}"):
                     st.write("**Problem:**", issue.get("description"))
                     st.write("**Suggestion:**", issue.get("suggestion"))
-                    if issue.get("metadata"):
-                        st.caption("metadata")
-                        st.json(issue.get("metadata"))
+                    st.caption("metadata")
+                    st.json(issue.get("metadata"))
+            if pending:
+                st.markdown("".join(pending), unsafe_allow_html=True)
 
-    with tabs[2]:
-        if not flake8_issues:
-            st.info("No flake8 findings.")
-        else:
-            for j, it in enumerate(flake8_issues, 1):
-                loc = f"{it.get('path', 'input.py')}:{it.get('row', '?')}:{it.get('col', '?')}"
-                st.markdown(f"**{j}. {it.get('code', '')}** — {it.get('message', '')}")
-                st.caption(loc)
-
-    with tabs[3]:
-        if not bandit_results:
-            st.info("No bandit findings.")
-        else:
-            for j, it in enumerate(bandit_results, 1):
-                test_id = it.get("test_id") or it.get("test_name") or "bandit"
-                sev_b = it.get("issue_severity") or "unknown"
-                conf = it.get("issue_confidence") or "unknown"
-                text = it.get("issue_text") or it.get("issue") or ""
-                fname = it.get("filename") or ""
-                line = it.get("line_number") or it.get("line") or ""
-                where = f"{fname}:{line}" if fname or line else ""
-
-                st.markdown(f"**{j}. {test_id}** — severity={sev_b}, confidence={conf}")
-                if text:
-                    st.write(text)
-                if where:
-                    st.caption(where)
-
-    with tabs[4]:
-        strict_text = (data or {}).get("strict_findings")
-        if strict_text:
+    if "flake8" in tabs:
+        with tabs["flake8"]:
+            st.markdown(view.flake8_md)
+
+    if "bandit" in tabs:
+        with tabs["bandit"]:
+            st.markdown(view.bandit_md)
+
+    if "Strict" in tabs:
+        with tabs["Strict"]:
             st.code(strict_text)
-        else:
-            st.info("Strict mode not enabled or no strict findings returned.")
 
-    with tabs[5]:
-        st.json(data)
+    with tabs["Raw JSON"]:
+        st.code(view.raw_json, language="json")
 
 
 def _fingerprint_secret(s: str) -> str:
@@ -645,36 +931,27 @@ def _fingerprint_secret(s: str) -> str:
         return "(empty)"
     if len(s) <= 8:
         return "*" * len(s)
-    return "%s…%s" % (s[:4], s[-4:])
+    return f"{s[:4]}…{s[-4:]}"
 
 
-def _firebase_probe_api_key(*, api_key: str) -> Tuple[bool, str]:
-    """Probe Firebase Identity Toolkit endpoint to validate the API key.
-
-    Uses a deliberately invalid payload: if the key is valid, Firebase should return
-    INVALID_EMAIL / MISSING_PASSWORD / etc. If the key is invalid, it returns
-    API_KEY_INVALID.
-    """
-    api_key = (api_key or "").strip()
-    if not api_key:
-        return False, "FIREBASE_WEB_API_KEY is empty"
-
-    url = "https://identitytoolkit.googleapis.com/v1/accounts:signInWithPassword?key=%s" % api_key
-    try:
-        resp = requests.post(
-            url, json={"email": "not-an-email", "password": "x", "returnSecureToken": True}, timeout=10
-        )
-    except requests.exceptions.RequestException as e:
-        return False, "Probe failed: %s" % e.__class__.__name__
+@st.cache_data(ttl=600, max_entries=4, show_spinner=False)
+def _firebase_probe_api_key_cached(api_key: str) -> Tuple[bool, str]:
+    # Like _firebase_preflight_cached: transport errors propagate so they are never cached.
+    resp = _http().post(
+        _FB_SIGNIN,
+        params={"key": api_key},
+        json={"email": "not-an-email", "password": "x", "returnSecureToken": True},
+        timeout=10,
+    )
 
     if resp.status_code == 200:
         return True, "Key looks valid (endpoint accepted request)"
 
     # Parse firebase error message
     try:
-        payload = resp.json()
+        payload = _json_body(resp)
     except ValueError:
-        return False, "Probe: HTTP %s (non-JSON)" % resp.status_code
+        return False, f"Probe: HTTP {resp.status_code} (non-JSON)"
 
     msg = None
     if isinstance(payload, dict):
@@ -687,54 +964,54 @@ def _firebase_probe_api_key(*, api_key: str) -> Tuple[bool, str]:
 
     # Any other error implies the key is likely valid (but credentials are wrong)
     if msg:
-        return True, "Key looks valid (Firebase responded: %s)" % msg
+        return True, f"Key looks valid (Firebase responded: {msg})"
 
     return False, "Probe returned unexpected response"
 
 
+def _firebase_probe_api_key(*, api_key: str) -> Tuple[bool, str]:
+    """Probe Firebase Identity Toolkit endpoint to validate the API key.
+
+    Uses a deliberately invalid payload: if the key is valid, Firebase should return
+    INVALID_EMAIL / MISSING_PASSWORD / etc. If the key is invalid, it returns
+    API_KEY_INVALID. Answers are cached per key for 10 minutes; network failures are not.
+    """
+    api_key = (api_key or "").strip()
+    if not api_key:
+        return False, "FIREBASE_WEB_API_KEY is empty"
+
+    try:
+        return _firebase_probe_api_key_cached(api_key)
+    except requests.exceptions.RequestException as e:
+        return False, f"Probe failed: {e.__class__.__name__}"
+
+
 # --- Session defaults ---
 if "theme" not in st.session_state:
     st.session_state["theme"] = "dark"
+st.session_state.setdefault("fx_blur", False)
 
-_apply_theme(mode=st.session_state["theme"])
+_apply_theme(mode=st.session_state["theme"], blur=st.session_state["fx_blur"])
 
-# Small helper shown only when sidebar is collapsed (CSS-controlled).
-st.markdown(
-    '<div class="cra-open-sidebar"><span>Use the top-left button to open the sidebar</span></div>',
-    unsafe_allow_html=True,
-)
+# Cached for a few seconds across reruns (see _probe_health); "Refresh status" clears it.
+health_ok, health_msg, health_payload = _probe_health(API_BASE_URL)
 
-# Header
-col_logo, col_title, col_user = st.columns([1, 6, 3], vertical_alignment="center")
+# Header: the logo stays an st.image (browser-cached media URL); the collapsed-sidebar hint, title
+# and status chips go out as one markdown element.
+col_logo, col_header = st.columns([1, 9], vertical_alignment="center")
 with col_logo:
-    if os.path.exists(_LOGO_PATH):
-        st.image(_LOGO_PATH, width=72)
-
-with col_title:
-    st.markdown('<div class="cra-title">CRA</div>', unsafe_allow_html=True)
-
-
-with col_user:
-    # Header chips (lightweight status at-a-glance)
-    ok = st.session_state.get("health_ok")
-    msg = st.session_state.get("health_msg")
-    if ok is True:
-        dot = "cra-dot cra-dot-ok"
-        status = "Healthy"
-    elif ok is False and msg:
-        dot = "cra-dot cra-dot-bad"
-        status = "Down"
-    else:
-        dot = "cra-dot cra-dot-warn"
-        status = "Unknown"
+    logo = _logo_bytes()
+    if logo:
+        st.image(logo, width=_LOGO_WIDTH)
 
+with col_header:
+    dot, status = ("cra-dot cra-dot-ok", "Healthy") if health_ok else ("cra-dot cra-dot-bad", "Down")
     st.markdown(
-        f"""
-        <div style="display:flex; gap:0.4rem; justify-content:flex-end; align-items:center; flex-wrap:wrap;">
-          <div class="cra-chip"><span class="{dot}"></span>API: {status}</div>
-          <div class="cra-chip">Mode: {st.session_state.get('theme','dark')}</div>
-        </div>
-        """,
+        '<div class="cra-open-sidebar"><span>Use the top-left button to open the sidebar</span></div>'
+        '<div class="cra-header"><div class="cra-title">CRA</div><div class="cra-chips">'
+        f'<div class="cra-chip"><span class="{dot}"></span>API: {status}</div>'
+        f'<div class="cra-chip">Mode: {html.escape(st.session_state.get("theme", "dark"))}</div>'
+        "</div></div>",
         unsafe_allow_html=True,
     )
 
@@ -742,35 +1019,28 @@ with col_user:
 with st.sidebar:
     # Optional GitHub profile card (shows in deployed app too)
     if GITHUB_PROFILE_URL and (GITHUB_USERNAME or GITHUB_AVATAR_URL):
-        st.markdown('<div class="cra-card">', unsafe_allow_html=True)
-        st.markdown('<div class="cra-card-title">Profile</div>', unsafe_allow_html=True)
         avatar_html = (
             f'<img class="cra-avatar" src="{GITHUB_AVATAR_URL}" alt="GitHub avatar" />' if GITHUB_AVATAR_URL else ""
         )
         name = GITHUB_USERNAME or "GitHub"
-        st.markdown(
+        _card_header(
+            "Profile",
             f'<div class="cra-profile">{avatar_html}<div><a href="{GITHUB_PROFILE_URL}" target="_blank">{name}</a>'
             f'<div style="color:var(--cra-muted); font-size:0.85rem;">{GITHUB_PROFILE_URL}</div></div></div>',
-            unsafe_allow_html=True,
         )
-        st.markdown("</div>", unsafe_allow_html=True)
 
-    st.markdown('<div class="cra-card">', unsafe_allow_html=True)
-    st.markdown('<div class="cra-card-title">Workspace</div>', unsafe_allow_html=True)
+    _card_header("Workspace")
     page = st.radio("Navigate", ["Review"], label_visibility="collapsed")
-    st.markdown("</div>", unsafe_allow_html=True)
 
-    st.markdown('<div class="cra-card">', unsafe_allow_html=True)
-    st.markdown('<div class="cra-card-title">Theme</div>', unsafe_allow_html=True)
+    _card_header("Theme")
     theme = st.radio("Mode", ["dark", "light"], index=0 if st.session_state["theme"] == "dark" else 1, horizontal=True)
     if theme != st.session_state["theme"]:
         st.session_state["theme"] = theme
         st.rerun()
-    st.markdown("</div>", unsafe_allow_html=True)
+    # Keyed widget: the new value is already in session_state when the rerun reaches _apply_theme.
+    st.checkbox("High-quality effects (blur)", key="fx_blur")
 
-    st.markdown('<div class="cra-card">', unsafe_allow_html=True)
-    st.markdown('<div class="cra-card-title">Backend</div>', unsafe_allow_html=True)
-    st.write("API:", API_BASE_URL)
+    _card_header("Backend", f"<p>API: {html.escape(API_BASE_URL)}</p>")
 
     if _is_default_local_api(API_BASE_URL) and os.getenv("CODE_REVIEW_API_URL") is None:
         st.warning(
@@ -778,93 +1048,137 @@ with st.sidebar:
             "In a deployed Streamlit app, set CODE_REVIEW_API_URL to your hosted API."
         )
 
-    now = time.time()
-    last_ts = st.session_state.get("health_ts", 0.0)
-    if st.button("Refresh status") or (now - last_ts) > 3:
-        ok, msg, payload = _healthcheck(API_BASE_URL)
-        st.session_state["health_ok"] = ok
-        st.session_state["health_msg"] = msg
-        st.session_state["health_payload"] = payload
-        st.session_state["health_ts"] = now
-
-    ok = st.session_state.get("health_ok", False)
-    msg = st.session_state.get("health_msg", "Unknown")
-    payload = st.session_state.get("health_payload")
-
-    if ok:
-        st.success(f"Status: {msg}")
-        if isinstance(payload, dict):
-            st.caption(f"Service: {payload.get('service', 'unknown')} | Version: {payload.get('version', 'unknown')}")
+    st.button("Refresh status", on_click=_refresh_status)
+
+    if health_ok:
+        st.success(f"Status: {health_msg}")
+        # One caption element for all status lines (markdown hard breaks), not one per line.
+        status_lines: List[str] = []
+        if isinstance(health_payload, dict):
+            status_lines.append(
+                f"Service: {health_payload.get('service', 'unknown')} | Version: {health_payload.get('version', 'unknown')}"
+            )
         cfg = _get_configz(API_BASE_URL)
         if cfg:
-            st.caption(f"LLM configured: {'yes' if cfg.get('llm_api_key_set') else 'no'}")
+            status_lines.append(f"LLM configured: {'yes' if cfg.get('llm_api_key_set') else 'no'}")
+        if status_lines:
+            st.caption("  \n".join(status_lines))
     else:
-        st.error(f"Status: {msg}")
+        st.error(f"Status: {health_msg}")
         st.caption("Start the API with: uvicorn app.main:app --reload")
 
-    st.markdown("</div>", unsafe_allow_html=True)
 
 # --- Main pages ---
 if page == "Review":
     st.subheader("New review")
 
+    # The input-mode switch stays outside the form: it decides which fields the form shows.
     input_mode = st.radio("Input", ["Paste", "Upload file", "GitHub repo"], horizontal=True)
-    strict = st.toggle("Strict findings", value=False, help="Include strict_findings in the response")
-
-    language = st.selectbox("Language", ["python"], disabled=False)
 
-    if input_mode == "Paste":
-        filename = st.text_input("Filename (optional)", value="input.py")
-        code = st.text_area("Code", height=320, placeholder="Paste your Python code here...")
-        if st.button("Review", type="primary"):
-            if not code.strip():
+    # Everything else is batched in a form, so typing or toggling does not rerun the script
+    # (sidebar, probes, theme) until "Review" is pressed.
+    with st.form("review_form", clear_on_submit=False, border=False):
+        strict = st.toggle("Strict findings", value=False, help="Include strict_findings in the response")
+        language = st.selectbox("Language", ["python"], disabled=False)
+
+        if input_mode == "Paste":
+            filename = st.text_input("Filename (optional)", value="input.py")
+            # Keyed and read only on submit; inside the form it never round-trips on other interactions.
+            st.text_area("Code", height=320, placeholder="Paste your Python code here...", key="code_input")
+        elif input_mode == "Upload file":
+            # The uploader itself shows the selected file's name and size.
+            up = st.file_uploader("Upload a .py file", type=["py"], accept_multiple_files=False)
+        else:
+            repo_url = st.text_input("GitHub repo URL", placeholder="https://github.com/owner/repo")
+            paths_text = st.text_area(
+                "File path(s)",
+                value="app/main.py",
+                height=80,
+                help="Path to a .py file in the repo; several paths (one per line or comma-separated) are reviewed in one request",
+            )
+            ref = st.text_input("Ref (branch/tag/sha)", value="main")
+
+        submitted = st.form_submit_button("Review", type="primary")
+
+    if submitted:
+        data: Optional[Dict[str, Any]] = None
+        err: Optional[str] = None
+        attempted = False
+        # Identical re-submissions of pasted/uploaded code reuse the earlier response. GitHub reviews
+        # are not cached: the file behind a branch ref can change between clicks.
+        review_cache: Dict[str, Dict[str, Any]] = st.session_state.setdefault("review_cache", {})
+        key: Optional[str] = None
+        batch = False
+        if input_mode == "Paste":
+            code = st.session_state.get("code_input") or ""
+            if not code or code.isspace():
                 st.warning("Please paste some code first.")
             else:
-                with st.spinner("Reviewing..."):
-                    data, err = _post_review(
-                        API_BASE_URL, code=code, language=language, filename=filename, strict=strict
-                    )
-                if err:
-                    st.error("Review failed")
-                    st.code(err)
-                else:
-                    st.session_state["last_response"] = data
-                    _render_review_response(data or {})
-
-    elif input_mode == "Upload file":
-        up = st.file_uploader("Upload a .py file", type=["py"], accept_multiple_files=False)
-        if up is not None:
-            st.caption(f"Selected: {up.name} ({up.size} bytes)")
-        if st.button("Review", type="primary"):
+                attempted = True
+                key = _submission_key("paste", API_BASE_URL, language, filename, strict, code)
+                data = review_cache.get(key)
+                if data is None:
+                    with st.spinner("Reviewing..."):
+                        data, err = _post_review(
+                            API_BASE_URL, code=code, language=language, filename=filename, strict=strict
+                        )
+        elif input_mode == "Upload file":
             if up is None:
                 st.warning("Upload a .py file first.")
+            elif up.size > _UPLOAD_MAX_BYTES:
+                st.warning(f"File too large: {up.size / 1048576:.1f} MB (limit {_UPLOAD_MAX_BYTES // 1048576} MB).")
             else:
-                with st.spinner("Reviewing..."):
-                    data, err = _post_review_file(API_BASE_URL, filename=up.name, content=up.getvalue())
-                if err:
-                    st.error("Review failed")
-                    st.code(err)
+                with up.getbuffer() as buf:
+                    text_ok = _utf8_prefix_ok(buf)
+                    key = _submission_key("file", API_BASE_URL, up.name, buf) if text_ok else None
+                if key is None:
+                    st.warning("Uploaded file must be UTF-8 encoded text.")
                 else:
-                    st.session_state["last_response"] = data
-                    _render_review_response(data or {})
-
-    else:
-        repo_url = st.text_input("GitHub repo URL", placeholder="https://github.com/owner/repo")
-        path = st.text_input("File path", value="app/main.py", help="Path to a .py file in the repo")
-        ref = st.text_input("Ref (branch/tag/sha)", value="main")
-        if st.button("Review", type="primary"):
+                    attempted = True
+                    data = review_cache.get(key)
+                    if data is None:
+                        with st.spinner("Reviewing..."):
+                            data, err = _post_review_file(API_BASE_URL, filename=up.name, fileobj=up)
+        else:
             if not repo_url.strip():
                 st.warning("Enter a repo URL.")
             else:
+                attempted = True
+                paths = _split_paths(paths_text)
+                batch = len(paths) > 1
                 with st.spinner("Fetching + reviewing..."):
-                    data, err = _post_review_github(API_BASE_URL, repo_url=repo_url, path=path, ref=ref, strict=strict)
-                if err:
-                    st.error("Review failed")
-                    st.code(err)
+                    if batch:
+                        data, err = _post_review_github_batch(
+                            API_BASE_URL, repo_url=repo_url, paths=paths, ref=ref, strict=strict
+                        )
+                    else:
+                        data, err = _post_review_github(
+                            API_BASE_URL, repo_url=repo_url, path=paths[0] if paths else "", ref=ref, strict=strict
+                        )
+
+        if attempted:
+            if err:
+                st.error("Review failed")
+                st.code(err)
+            else:
+                if key is not None and data is not None:
+                    _remember_review(review_cache, key, data)
+                st.session_state["last_response"] = data
+                if batch:
+                    st.session_state["last_response_json"] = _pretty_json(data)
+                    for i, item in enumerate((data or {}).get("results") or []):
+                        st.markdown(f"#### `{item.get('path')}`")
+                        if item.get("error"):
+                            st.error(item["error"])
+                        else:
+                            _render_review_response(_format_review(item.get("review") or {}), key=f"review_{i}")
                 else:
-                    st.session_state["last_response"] = data
-                    _render_review_response(data or {})
+                    view = _format_review(data or {})
+                    st.session_state["last_response_json"] = view.raw_json
+                    _render_review_response(view)
 
     if st.session_state.get("last_response"):
-        with st.expander("Last response (cached)"):
-            st.json(st.session_state["last_response"])
+        # Expander bodies are sent to the browser even while collapsed, so gate the (possibly large)
+        # JSON behind a toggle; it is serialized once when the response arrived, not here.
+        if st.toggle("Show last response (cached)", key="show_last"):
+            st.code(st.session_state.get("last_response_json", ""), language="json")